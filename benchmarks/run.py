@@ -0,0 +1,441 @@
+"""Benchmarks for the rendering and resource loading hot paths of Font-Awesome-Flask.
+
+Run them from the root of the repository (with the package installed), e.g.:
+
+    $ python benchmarks/run.py > before.json
+    $ python benchmarks/run.py --quick --output after.json
+    $ python benchmarks/run.py --compare before.json
+
+Every benchmark reports the latency per call (min, median and mean over several repeats) and the memory allocated per call (the peak traced by :mod:`tracemalloc`, and what is retained afterwards). The results are written as JSON (to stdout, or to the file given with `--output`), so they can be compared across releases with `--compare`; progress is reported on stderr.
+
+Resources are never downloaded from the real CDN: a local stand-in server serves files of realistic sizes instead, and they are downloaded into a temporary cache directory (see `FONT_AWESOME_CACHE_DIR`).
+"""
+
+import argparse
+import gc
+import http.server
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from importlib.metadata import version as get_version
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from flask import Flask
+
+import flask_font_awesome
+from flask_font_awesome import FontAwesome
+
+ICONS = [
+    "fa-solid fa-house",
+    "fa-brands fa-github",
+    "fa-regular fa-square",
+    "fas fa-check",
+    "fab fa-python",
+]
+PAGE_SIZES = (10, 1_000, 100_000)
+# the ways of rendering a page of icons, by name
+PAGE_TEMPLATES = {
+    "method": "{% for name in icons %}{{ font_awesome.render_icon(name) }}{% endfor %}",
+    "macro": '{% from "font_awesome.html" import render_icon %}{% for name in icons %}{{ render_icon(name) }}{% endfor %}',
+    "filter": "{% for icon in icons | fa_icons %}{{ icon }}{% endfor %}",
+    "tag": "{% for name in icons %}{% fa_icon name %}{% endfor %}",
+    "tag-constant": '{% for name in icons %}{% fa_icon "fa-solid fa-house" %}{% endfor %}',
+}
+# the total number of icons rendered per repeat of a page benchmark (at least one page)
+PAGE_ICONS_PER_REPEAT = 10_000
+CDN_PATH = "ajax/libs/font-awesome/{version}"
+
+
+class Benchmark(NamedTuple):
+    """A function to measure, with the number of calls per repeat."""
+
+    group: str
+    name: str
+    function: Callable[[], Any]
+    number: int
+    setup: Optional[Callable[[], Any]] = None
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _write_cdn_files(root: Path, version: str) -> None:
+    """Write stand-ins for the CDN resources of the given version (with realistic sizes) to the given folder."""
+    rng = random.Random(0)
+    folder = root / CDN_PATH.format(version=version)
+    header = f"/*!\n * Font Awesome Free {version} by @fontawesome\n */\n"
+    js = (flask_font_awesome.STATIC_FOLDER / "js" / "all.min.js").read_text()
+    sizes = {"all": 80_000, "fontawesome": 70_000}
+    for style in (*FontAwesome.style_choices, FontAwesome.core_style):
+        for possibly_min in (".min", ""):
+            css = folder / "css" / f"{style}{possibly_min}.css"
+            css.parent.mkdir(parents=True, exist_ok=True)
+            rules = "".join(
+                f'.fa-icon-{i}{{--fa:"\\f{i % 4096:03x}"}}'
+                for i in range(sizes.get(style, 2_000) // 28)
+            )
+            css.write_text(header + rules)
+            file = folder / "js" / f"{style}{possibly_min}.js"
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.write_text(js if style == "all" else header + js[: len(js) // 4])
+    for webfont in FontAwesome.webfonts_map.values():
+        for ext, size in (("ttf", 400_000), ("woff2", 150_000)):
+            file = folder / "webfonts" / f"{webfont}.{ext}"
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.write_bytes(rng.getrandbits(8 * size).to_bytes(size, "little"))
+
+
+def _start_cdn(root: Path, latency: float) -> http.server.ThreadingHTTPServer:
+    """Start the stand-in CDN server for the given folder (on a free port, in the background)."""
+    handler = type("Handler", (_Handler,), {"latency": latency})
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(handler, directory=str(root))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Dict[str, Any]:
+    """Measure the latency and allocations per call of the function of the given benchmark.
+
+    Args:
+        benchmark (Benchmark): The benchmark.
+        repeat (int): The number of repeats (of `benchmark.number` calls each).
+
+    Returns:
+        Dict[str, Any]: The measurements, in nanoseconds and bytes.
+    """
+    function, number, setup = benchmark.function, benchmark.number, benchmark.setup
+    if setup is not None:
+        setup()
+    function()  # warm up (e.g. compile templates, fill caches)
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            elapsed = 0
+            for _ in range(number):
+                if setup is not None:
+                    setup()
+                start = time.perf_counter_ns()
+                function()
+                elapsed += time.perf_counter_ns() - start
+            timings.append(elapsed / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "group": benchmark.group,
+        "name": benchmark.name,
+        "number": number,
+        "repeat": repeat,
+        "min_ns": min(timings),
+        "median_ns": statistics.median(timings),
+        "mean_ns": statistics.mean(timings),
+        "peak_bytes": max(peak - before, 0),
+        "retained_bytes": current - before,
+    }
+
+
+def _create_app(cache_dir: Path, cdn_url_template: str, **config: Any) -> Flask:
+    app = Flask(__name__)
+    app.config.update(
+        FONT_AWESOME_CACHE_DIR=str(cache_dir),
+        FONT_AWESOME_CDN_URL_TEMPLATE=cdn_url_template,
+        **config,
+    )
+    FontAwesome(app)
+    return app
+
+
+def bench_render(cache_dir: Path, cdn_url_template: str) -> Iterator[Benchmark]:
+    """Benchmark rendering single icons, in every render mode and with and without the icon cache."""
+    variants: Dict[str, Dict[str, Any]] = {
+        "class": {},
+        "class-uncached": {"FONT_AWESOME_ICON_CACHE_SIZE": 0},
+        "svg": {"FONT_AWESOME_RENDER_MODE": "svg"},
+        "svg-uncached": {
+            "FONT_AWESOME_RENDER_MODE": "svg",
+            "FONT_AWESOME_ICON_CACHE_SIZE": 0,
+        },
+        "sprite": {"FONT_AWESOME_RENDER_MODE": "sprite"},
+    }
+    for variant, config in variants.items():
+        app = _create_app(cache_dir, cdn_url_template, **config)
+        font_awesome: FontAwesome = app.extensions["font_awesome"]
+        with app.test_request_context():
+            yield Benchmark(
+                "render",
+                f"render_icon[{variant}]",
+                partial(font_awesome.render_icon, "fa-solid fa-house", size="lg"),
+                10_000,
+            )
+            yield Benchmark(
+                "render",
+                f"render_stacked_icon[{variant}]",
+                partial(
+                    font_awesome.render_stacked_icon,
+                    "fa-solid fa-square",
+                    "fab fa-github",
+                    inverse=True,
+                ),
+                10_000,
+            )
+
+
+def bench_load(cache_dir: Path, cdn_url_template: str) -> Iterator[Benchmark]:
+    """Benchmark generating the markup of `load_css` / `load_js`, from the CDN and served locally, with and without the markup cache."""
+    variants: Dict[str, Dict[str, Any]] = {
+        "cdn": {},
+        "cdn-uncached": {"FONT_AWESOME_MARKUP_CACHE_SIZE": 0},
+        "local": {
+            "FONT_AWESOME_SERVE_LOCAL": True,
+            "FONT_AWESOME_DOWNLOAD_IN_BACKGROUND": False,
+        },
+        "local-uncached": {
+            "FONT_AWESOME_SERVE_LOCAL": True,
+            "FONT_AWESOME_DOWNLOAD_IN_BACKGROUND": False,
+            "FONT_AWESOME_MARKUP_CACHE_SIZE": 0,
+        },
+        "local-bundle-uncached": {
+            "FONT_AWESOME_SERVE_LOCAL": True,
+            "FONT_AWESOME_BUNDLE": True,
+            "FONT_AWESOME_DOWNLOAD_IN_BACKGROUND": False,
+            "FONT_AWESOME_MARKUP_CACHE_SIZE": 0,
+        },
+    }
+    for variant, config in variants.items():
+        app = _create_app(cache_dir, cdn_url_template, **config)
+        font_awesome: FontAwesome = app.extensions["font_awesome"]
+        with app.test_request_context():
+            for method in ("load_css", "load_js"):
+                yield Benchmark(
+                    "load",
+                    f"{method}[{variant}]",
+                    partial(getattr(font_awesome, method), style=["solid", "brands"]),
+                    1_000,
+                )
+
+
+def bench_local(cache_dir: Path, cdn_url_template: str) -> Iterator[Benchmark]:
+    """Benchmark serving resources locally: loading them cold (i.e. downloading them from the stand-in CDN first, into a fresh cache directory), and serving them."""
+    config = {
+        "FONT_AWESOME_SERVE_LOCAL": True,
+        "FONT_AWESOME_DOWNLOAD_IN_BACKGROUND": False,
+    }
+    cold_dirs = iter(range(sys.maxsize))
+    cold_apps: List[Flask] = []
+
+    def create_cold_app() -> None:
+        cold_apps[:] = [
+            _create_app(
+                cache_dir / f"cold-{next(cold_dirs)}", cdn_url_template, **config
+            )
+        ]
+
+    def load_cold(method: str) -> None:
+        with cold_apps[0].test_request_context():
+            getattr(cold_apps[0].extensions["font_awesome"], method)()
+
+    for method in ("load_css", "load_js"):
+        yield Benchmark(
+            "local",
+            f"{method}[local, cold]",
+            partial(load_cold, method),
+            1,
+            create_cold_app,
+        )
+
+    app = _create_app(cache_dir, cdn_url_template, **config)
+    version = FontAwesome.version
+    with app.test_request_context():
+        app.extensions["font_awesome"].load_js()  # download the served file
+    client = app.test_client()
+
+    def get_static_file(coding: str) -> None:
+        client.get(
+            f"/font_awesome/cache/{version}/js/all.min.js",
+            headers={"Accept-Encoding": coding},
+        ).close()
+
+    for coding in ("identity", "gzip"):
+        yield Benchmark(
+            "local",
+            f"static route[local, all.min.js, {coding}]",
+            partial(get_static_file, coding),
+            100,
+        )
+
+
+def bench_pages(
+    cache_dir: Path, cdn_url_template: str, sizes: List[int]
+) -> Iterator[Benchmark]:
+    """Benchmark rendering full pages of icons with the methods of the extension, the macros of `font_awesome.html`, the `fa_icons` filter and the `fa_icon` tag."""
+    app = _create_app(cache_dir, cdn_url_template)
+    with app.test_request_context():
+        for size in sizes:
+            icons = [ICONS[i % len(ICONS)] for i in range(size)]
+            for variant, source in PAGE_TEMPLATES.items():
+                template = app.jinja_env.from_string(source)
+                yield Benchmark(
+                    "page",
+                    f"page[{variant}, {size}]",
+                    partial(template.render, icons=icons),
+                    max(1, PAGE_ICONS_PER_REPEAT // size),
+                )
+
+
+def _format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def compare(results: List[Dict[str, Any]], baseline_file: Path) -> None:
+    """Print the change of the median latency of the given results relative to those in the given results file."""
+    baseline = {
+        result["name"]: result
+        for result in json.loads(baseline_file.read_text())["results"]
+    }
+    print(
+        f"\nCompared with {baseline_file} (median latency, lower is better):",
+        file=sys.stderr,
+    )
+    for result in results:
+        old = baseline.get(result["name"])
+        if old is None:
+            continue
+        print(
+            f"{result['name']:<45} {_format_ns(old['median_ns']):>10} -> "
+            f"{_format_ns(result['median_ns']):>10} "
+            f"({result['median_ns'] / old['median_ns']:.2f}x)",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="The file to write the results to. Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="A results file to compare the results with."
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Run fewer repeats, and skip the largest pages.",
+    )
+    parser.add_argument(
+        "--cdn-latency",
+        type=float,
+        default=0.0,
+        help="The latency (in milliseconds) of the stand-in CDN. Defaults to 0.",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run the benchmarks whose name contains the given string.",
+    )
+    args = parser.parse_args(argv)
+    repeat = 3 if args.quick else 7
+    sizes = [size for size in PAGE_SIZES if not args.quick or size < 100_000]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cdn_root = Path(tmp) / "cdn"
+        _write_cdn_files(cdn_root, FontAwesome.version)
+        server = _start_cdn(cdn_root, args.cdn_latency / 1000)
+        cdn_url_template = (
+            f"http://127.0.0.1:{server.server_address[1]}/"
+            + CDN_PATH
+            + "/{type}/{style}{possibly_min}.{ext}"
+        )
+        cache_dir = Path(tmp) / "cache"
+        try:
+            for benchmarks in (
+                bench_render(cache_dir, cdn_url_template),
+                bench_load(cache_dir, cdn_url_template),
+                bench_local(cache_dir, cdn_url_template),
+                bench_pages(cache_dir, cdn_url_template, sizes),
+            ):
+                # the benchmarks are measured while their generator is suspended, i.e. within its application context
+                for benchmark in benchmarks:
+                    if args.filter not in benchmark.name:
+                        continue
+                    result = measure(benchmark, repeat)
+                    results.append(result)
+                    print(
+                        f"{result['name']:<45} {_format_ns(result['median_ns']):>10}"
+                        f" {result['peak_bytes']:>12,} B",
+                        file=sys.stderr,
+                    )
+        finally:
+            server.shutdown()
+
+    output = json.dumps(
+        {
+            "metadata": {
+                "version": flask_font_awesome.__version__,
+                "font_awesome_version": FontAwesome.version,
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "flask": get_version("flask"),
+                "jinja2": get_version("jinja2"),
+                "date": datetime.now(timezone.utc).isoformat(),
+                "quick": args.quick,
+                "cdn_latency_ms": args.cdn_latency,
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output is None:
+        print(output)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
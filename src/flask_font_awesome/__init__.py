@@ -1,24 +1,107 @@
 """Font-Awesome-Flask is an extension for Flask that adds support for Font Awesome to your web application."""
 
+import base64
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import mimetypes
+import os
 import re
+import shutil
 import sys
-import urllib.request
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 if sys.version_info < (3, 10):
     from importlib_resources import files
 else:
     from importlib.resources import files
 
-from flask import Blueprint, Flask, current_app, url_for
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    abort,
+    current_app,
+    g,
+    has_app_context,
+    has_request_context,
+    redirect,
+    request,
+    send_from_directory,
+    url_for,
+)
 from markupsafe import Markup
+from werkzeug.security import safe_join
+
+from . import compression, downloads, injection, signals, subset, svg
+from .cache import CacheInfo, LRUCache, record_file, recording_files
+from .extension import FontAwesomeExtension
+from .icons import Icon, IconIndex, parse_icon_name
+from .stats import Stats
 
 __version__ = "0.1.5"
 
 STATIC_FOLDER = Path(files("flask_font_awesome") / "static")  # type: ignore
+VERSIONS_FILE = Path(files("flask_font_awesome") / "versions.json")  # type: ignore
 CDN_URL_TEMPLATE = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{version}/{type}/{style}{possibly_min}.{ext}"
 VERSION_PATTERN = re.compile(r"Font Awesome (?:Free\s)?(\d+.\d+.\d+)")
+ICON_INDEX = IconIndex(STATIC_FOLDER / "js" / "all.min.js")
+SUBSET_STYLE = "subset"
+SUBSET_MANIFEST = "subset.json"
+SRI_MANIFEST = "sri.json"
+SRI_ALGORITHM = "sha384"
+SPRITE_FILE = "sprites/icons.svg"
+SVG_RENDER_MODES = ("svg", "sprite")
+# the configuration that decides how resources are loaded, read when the extension is initialized (or its caches are cleared)
+LOAD_CONFIG_KEYS = (
+    "FONT_AWESOME_SERVE_LOCAL",
+    "FONT_AWESOME_DOWNLOAD_ON_DEMAND",
+    "FONT_AWESOME_DOWNLOAD_IN_BACKGROUND",
+    "FONT_AWESOME_CDN_FALLBACK",
+    "FONT_AWESOME_USE_SUBSET",
+    "FONT_AWESOME_BUNDLE",
+    "FONT_AWESOME_PRELOAD",
+)
+
+
+# e.g. `all.min.0123456789.js`, see `FONT_AWESOME_FINGERPRINT_URLS`
+FINGERPRINT_PATTERN = re.compile(
+    r"(?P<stem>.+)\.(?P<fingerprint>[0-9a-f]{10})(?P<suffix>\.[^./]+)"
+)
+IMMUTABLE_MAX_AGE = 31536000  # one year
+# the tags that load a resource, by type
+RESOURCE_TAGS = {
+    "css": '<link rel="stylesheet" href="{url}"{attributes} />',
+    "js": '<script defer src="{url}"{attributes}></script>',
+}
+# see `FONT_AWESOME_BUNDLE`, e.g. `css/bundle-solid-brands.min.css`
+BUNDLE_STYLE_PREFIX = "bundle-"
+BUNDLE_SEPARATORS = {"css": b"\n", "js": b";\n"}
+# the file (in each version folder of the cache directory) whose mtime records when that version was last used
+CACHE_ACCESS_MARKER = ".last-access"
+CACHE_ACCESS_INTERVAL = 60  # the minimum number of seconds between updates of an access marker (per process)
+# the maximum number of unique icons remembered (and rendered only once) per call to `render_icons`
+RENDER_ICONS_MEMO_SIZE = 1024
 
 
 def _remove_prefix(s: str, prefix: str) -> str:
@@ -27,6 +110,184 @@ def _remove_prefix(s: str, prefix: str) -> str:
     return s.removeprefix(prefix)
 
 
+class _StaticBlueprint(Blueprint):
+    """A blueprint whose static routes serve the precompressed siblings of static files to clients that accept them, and fingerprinted static files (e.g. `all.min.0123456789.js`) as immutable."""
+
+    def send_static_file(self, filename: str) -> Response:
+        return self._send_file(str(self.static_folder), filename)
+
+    def send_cached_file(self, version: str, filename: str) -> Response:
+        """Send a static file of the given version from the cache directory (see `FONT_AWESOME_CACHE_DIR`)."""
+        cache_dir = FontAwesome._get_cache_dir()
+        folder = safe_join(str(cache_dir), version) if cache_dir is not None else None
+        if folder is None or not os.path.isdir(folder):
+            abort(404)
+        FontAwesome._record_access(Path(folder))
+        return self._send_file(folder, filename)
+
+    def _send_file(self, folder: str, filename: str) -> Response:
+        max_age = self.get_send_file_max_age(filename)
+        etag: Union[bool, str] = True
+        match = FINGERPRINT_PATTERN.fullmatch(filename)
+        if match is not None:
+            unfingerprinted = f"{match['stem']}{match['suffix']}"
+            file = safe_join(folder, unfingerprinted)
+            if file is not None and os.path.isfile(file):
+                fingerprint = FontAwesome._get_fingerprint(Path(file))
+                if match["fingerprint"] != fingerprint:
+                    # e.g. a (cached) page from before the file was updated
+                    values = {
+                        **(request.view_args or {}),
+                        "filename": f"{match['stem']}.{fingerprint}{match['suffix']}",
+                    }
+                    return redirect(url_for(str(request.endpoint), **values))  # type: ignore
+                filename = unfingerprinted
+                max_age = IMMUTABLE_MAX_AGE
+                etag = fingerprint
+        coding = self._get_content_coding(folder, filename)
+        if coding is None:
+            response = send_from_directory(folder, filename, max_age=max_age, etag=etag)
+        else:
+            response = send_from_directory(
+                folder,
+                filename + compression.CONTENT_CODINGS[coding][0],
+                mimetype=mimetypes.guess_type(filename)[0],
+                max_age=max_age,
+                etag=f"{etag}-{coding}" if isinstance(etag, str) else etag,
+            )
+            response.headers["Content-Encoding"] = coding
+        if Path(filename).suffix in compression.COMPRESSIBLE_SUFFIXES:
+            response.vary.add("Accept-Encoding")
+        if max_age == IMMUTABLE_MAX_AGE:
+            response.cache_control.immutable = True
+        return response
+
+    @staticmethod
+    def _get_content_coding(folder: str, filename: str) -> Optional[str]:
+        """Get the best content coding accepted by the client of which the given static file has a precompressed sibling."""
+        if Path(filename).suffix not in compression.COMPRESSIBLE_SUFFIXES:
+            return None
+        file = safe_join(folder, filename)
+        if file is None:
+            return None
+        return request.accept_encodings.best_match(
+            [
+                coding
+                for coding in compression.CONTENT_CODINGS
+                if compression.get_compressed(Path(file), coding)
+            ]
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_versions() -> Dict[str, Any]:
+    """Get the version manifest: the latest version, and the SRI hashes of the CDN resources of every version (loaded on first use)."""
+    return json.loads(VERSIONS_FILE.read_text())
+
+
+def _get_cdn_sri(version: str, style: str, use_min: bool, ext: str) -> Optional[str]:
+    """Get the SRI hash of the CDN resource for the given version, style, extension, and possibly-minified suffix, if known."""
+    possibly_min = ".min" if use_min else ""
+    files = _get_versions()["versions"].get(version, {})
+    return files.get(f"{ext}/{style}{possibly_min}.{ext}")
+
+
+def _get_preload_tag(url: str, _as: str, sri: Optional[str] = None) -> str:
+    """Get the `<link rel="preload">` tag for the given URL and type of resource (`font` or `script`)."""
+    attributes = ' type="font/woff2"' if _as == "font" else ""
+    if sri is not None:
+        attributes += f' integrity="{sri}"'
+    return f'<link rel="preload" href="{url}" as="{_as}"{attributes} crossorigin="anonymous" />'
+
+
+def _get_preload_link(url: str, _as: str) -> str:
+    """Get the value of the `Link` header that preloads the given URL and type of resource (`font` or `script`)."""
+    params = '; type="font/woff2"' if _as == "font" else ""
+    return f"<{url}>; rel=preload; as={_as}{params}; crossorigin=anonymous"
+
+
+class _VersionsAttribute:
+    """A class attribute that is read from the version manifest on first access (rather than when this module is imported)."""
+
+    def __init__(self, getter: Callable[[Any], Any]) -> None:
+        self.getter = getter
+
+    def __get__(self, instance: Any, owner: Any) -> Any:
+        return self.getter(owner)
+
+
+def _get_sri(data: bytes, algorithm: str = SRI_ALGORITHM) -> str:
+    """Get the Subresource Integrity (SRI) hash of the given data."""
+    return _format_sri(hashlib.new(algorithm, data).digest(), algorithm)
+
+
+def _format_sri(digest: bytes, algorithm: str = SRI_ALGORITHM) -> str:
+    """Format the given digest as a Subresource Integrity (SRI) hash."""
+    return f"{algorithm}-{base64.b64encode(digest).decode()}"
+
+
+class _AssetState:
+    """The state of the local resources of an application (in its cache directory, or in the static folder of this package)."""
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        # (folder, version, style, use_min, ext) -> (mtime, size) of the file last verified to be of that version
+        self.versions: Dict[Tuple[str, str, str, bool, str], Tuple[int, int]] = {}
+        # file -> (mtime, size), digest and download validators of that file (mirrored in the SRI manifest, see `FontAwesome._get_digest`)
+        self.digests: Dict[Path, Tuple[Tuple[int, int], bytes, Dict[str, str]]] = {}
+        # the folders whose SRI manifest has been read into `digests`
+        self.digests_loaded: Set[Path] = set()
+        self.digests_lock = threading.Lock()
+        # version folder (of the cache directory) -> time its access marker was last updated
+        self.accessed: Dict[Path, float] = {}
+        # with a cache directory, the icon index is kept out of the package directory as well
+        self.icon_index = (
+            ICON_INDEX
+            if cache_dir is None
+            else IconIndex(ICON_INDEX.source, cache_dir / "icons.idx")
+        )
+
+
+class _AppState:
+    """The state of an extension instance for one application, as the same instance may be initialized for several applications (see `FontAwesome.init_app`)."""
+
+    def __init__(
+        self,
+        render_icon: Callable[..., Markup],
+        config: Mapping[str, Any],
+        stats: Optional[Stats] = None,
+    ) -> None:
+        self.markup_cache = LRUCache(config.get("FONT_AWESOME_MARKUP_CACHE_SIZE", 128))
+        self.cached_render_icon = functools.lru_cache(
+            config.get("FONT_AWESOME_ICON_CACHE_SIZE", 1024)
+        )(render_icon)
+        self.stats = stats
+        self.sprite_built = False
+        cache_dir = config.get("FONT_AWESOME_CACHE_DIR")
+        self.assets = _AssetState(Path(cache_dir) if cache_dir is not None else None)
+        # incremented whenever a static file is (re)written, to invalidate the cached markup that may refer to it
+        self.generation = 0
+        self._generation_lock = threading.Lock()
+        self.load_config(config)
+
+    def load_config(self, config: Mapping[str, Any]) -> None:
+        """Take a snapshot of the configuration that decides how resources are loaded (see `LOAD_CONFIG_KEYS`), so it is not looked up for every cached resource."""
+        self.config: Dict[str, Any] = {key: config.get(key) for key in LOAD_CONFIG_KEYS}
+
+    def invalidate_markup(self) -> None:
+        """Invalidate all cached markup, as a static file it may refer to was (re)written."""
+        with self._generation_lock:
+            self.generation += 1
+
+    def is_valid_markup(
+        self, entry: Tuple[Markup, Tuple[str, ...], Tuple[Any, ...], int]
+    ) -> bool:
+        """Check whether the given markup cache entry is still valid, i.e. no static file was written since it was generated, and the local files it was generated from are unchanged (e.g. not replaced by another process)."""
+        return entry[3] == self.generation and all(
+            FontAwesome._get_signature(file) == signature
+            for file, signature in entry[2]
+        )
+
+
 class FontAwesome:
     """Font Awesome icons for Flask."""
 
@@ -35,16 +296,27 @@ class FontAwesome:
     core_style = "fontawesome"
     use_min = True
     use_css = False
-    version = "7.0.1"
-    css_sri_map = {'all': 'sha512-2SwdPD6INVrV/lHTZbO2nodKhrnDdJK9/kg2XD1r9uGqPo1cUbujc+IYdlYdEErWNu69gVcYgdxlmVmzTWnetw==', 'regular': 'sha512-x3gns+l9p4mIK7vYLOCUoFS2P1gavFvnO9Its8sr0AkUk46bgf9R51D8xeRUwCSk+W93YbXWi19BYzXDNBH5SA==', 'solid': 'sha512-EHa6vH03/Ty92WahM0/tet1Qicl76zihDCkBnFhN3kFGQkC+mc86d7V+6y2ypiLbk3h0beZAGdUpzfMcb06cMg==', 'brands': 'sha512-WxpJXPm/Is1a/dzEdhdaoajpgizHQimaLGL/QqUIAjIihlQqlPQb1V9vkGs9+VzXD7rgI6O+UsSKl4u5K36Ydw==', 'fontawesome': 'sha512-M5Kq4YVQrjg5c2wsZSn27Dkfm/2ALfxmun0vUE3mPiJyK53hQBHYCVAtvMYEC7ZXmYLg8DVG4tF8gD27WmDbsg=='}
-    js_sri_map = {'all': 'sha512-6BTOlkauINO65nLhXhthZMtepgJSghyimIalb+crKRPhvhmsCdnIuGcVbR5/aQY2A+260iC1OPy1oCdB6pSSwQ==', 'regular': 'sha512-Zq4D1wxoa4GRA5ejM+34rZkeuuKX8Xq9rIsfsX2yH3NKG4SyJT8BjLFIIQSgN7F8oe2IIHlGbVsDzdTgjB1lgA==', 'solid': 'sha512-JqavQXK1jFoFcjU3kIvom9jdj3R76Ar8+ZcWezTLONsfi5Y3yibIqq0FyqP4R//K/G3ow84fIH0wBXKWpJf2EQ==', 'brands': 'sha512-1oGeXc5l4herTE3V53KHlBbraV/KLHfpqCNjqhT/A6xcxXXhZa+TaXRKDMn/cCXWfWyo+JheaQDcd0n1HTLkkg==', 'fontawesome': 'sha512-obFNtQ1JKCrxPBPLmYDUevlriATl5EhvwU3CFtdW/HKOkeAe0bbsyZfHO44/f1QyndrZJ464TQvrRP9ZjyXSSA=='}
+    version = _VersionsAttribute(lambda cls: _get_versions()["latest"])
+    css_sri_map = _VersionsAttribute(lambda cls: cls._get_sri_map(cls.version, "css"))
+    js_sri_map = _VersionsAttribute(lambda cls: cls._get_sri_map(cls.version, "js"))
     webfonts_map = {
         "regular": "fa-regular-400",
         "solid": "fa-solid-900",
         "brands": "fa-brands-400",
     }
 
+    # the state of the static folder of this package, used outside of an application context
+    _assets = _AssetState()
+    # (folder, version, styles, use_min, ext) -> pending background download, see `FONT_AWESOME_DOWNLOAD_IN_BACKGROUND`
+    _background_downloads: Dict[
+        Tuple[str, str, Tuple[str, ...], bool, str], "Future[None]"
+    ] = {}
+    _background_executor: Optional[ThreadPoolExecutor] = None
+    _background_lock = threading.Lock()
+
     def __init__(self, app: Optional[Flask] = None) -> None:
+        # used outside of an application context
+        self._state = _AppState(self._render_icon, {})
         if app is not None:
             self.init_app(app)
 
@@ -56,35 +328,180 @@ class FontAwesome:
         app.extensions["font_awesome"] = self
 
         # create and register blueprint for this extension instance
-        blueprint = Blueprint(
+        blueprint = _StaticBlueprint(
             "font_awesome",
             __name__,
-            static_folder=STATIC_FOLDER.name,
+            static_folder=STATIC_FOLDER,
             static_url_path=f"/font_awesome{app.static_url_path}",
             template_folder="templates",
         )
+        blueprint.add_url_rule(
+            f"/font_awesome{app.static_url_path}/svg-inline.css",
+            "svg_css",
+            self._send_svg_css,
+        )
+        blueprint.add_url_rule(
+            "/font_awesome/cache/<version>/<path:filename>",
+            "cache",
+            blueprint.send_cached_file,
+        )
         app.register_blueprint(blueprint)
 
+        # register the `flask font-awesome` command group
+        from .cli import cli
+
+        app.cli.add_command(cli)
+
         # register extension instance with the Jinja2 environment (for use in templates)
         app.jinja_env.globals["font_awesome"] = self
+        app.jinja_env.add_extension(FontAwesomeExtension)
+        app.jinja_env.filters["fa_icons"] = self.render_icons
+
+        # add the preload `Link` headers of the resources loaded while handling a request
+        app.after_request(self._add_preload_headers)
+        # send the icon render statistics of a request once it has been handled
+        app.after_request(self._send_render_stats)
 
         # set default configuration values for this extension instance
         app.config.setdefault("FONT_AWESOME_SERVE_LOCAL", False)
+        app.config.setdefault("FONT_AWESOME_DOWNLOAD_ON_DEMAND", True)
+        app.config.setdefault("FONT_AWESOME_MARKUP_CACHE_SIZE", 128)
+        app.config.setdefault("FONT_AWESOME_ICON_CACHE_SIZE", 1024)
+        app.config.setdefault("FONT_AWESOME_RENDER_MODE", "class")
+        app.config.setdefault("FONT_AWESOME_EXTERNAL_SPRITE", False)
+        app.config.setdefault("FONT_AWESOME_USE_SUBSET", False)
+        app.config.setdefault("FONT_AWESOME_FINGERPRINT_URLS", False)
+        app.config.setdefault("FONT_AWESOME_BUNDLE", False)
+        app.config.setdefault("FONT_AWESOME_PRELOAD", False)
+        app.config.setdefault("FONT_AWESOME_CACHE_DIR", None)
+        app.config.setdefault("FONT_AWESOME_CACHE_MAX_SIZE", None)
+        app.config.setdefault("FONT_AWESOME_STATS", False)
+        app.config.setdefault("FONT_AWESOME_CDN_URL_TEMPLATE", CDN_URL_TEMPLATE)
+        app.config.setdefault("FONT_AWESOME_CDN_FALLBACK", True)
+        # never block a request on a download while it can be served from the CDN instead
+        app.config.setdefault(
+            "FONT_AWESOME_DOWNLOAD_IN_BACKGROUND",
+            app.config["FONT_AWESOME_CDN_FALLBACK"],
+        )
+        app.config.setdefault("FONT_AWESOME_AUTO_INJECT", False)
+        for key, value in downloads.DOWNLOAD_DEFAULTS.items():
+            app.config.setdefault(key, value)
+
+        app.extensions["font_awesome_state"] = _AppState(
+            self._render_icon,
+            app.config,
+            Stats(app) if app.config["FONT_AWESOME_STATS"] else None,
+        )
+        if app.config["FONT_AWESOME_AUTO_INJECT"]:
+            # templates of this application record the icons whose markup they embed (see `FontAwesomeExtension`)
+            app.jinja_env.font_awesome_auto_inject = True  # type: ignore[attr-defined]
+            # registered last, so it runs before the other `after_request` functions (i.e. its preload links are sent)
+            app.before_request(self._record_rendered_icons)
+            app.after_request(self._inject_resources)
+
+    @property
+    def stats(self) -> Optional[Stats]:
+        """The statistics collected for the current application, if enabled (see `FONT_AWESOME_STATS`)."""
+        return self._get_state().stats
+
+    def clear_cache(self) -> None:
+        """Clear the caches of generated resource and icon markup of the current application.
+
+        Call this after changing the configuration of the application at runtime, as it is otherwise only read when the extension is initialized (or on a cache miss).
+        """
+        state = self._get_state()
+        if has_app_context():
+            state.load_config(current_app.config)
+        state.markup_cache.clear()
+        state.cached_render_icon.cache_clear()
+
+    def cache_info(self) -> CacheInfo:
+        """Get the hit/miss statistics of the cache of generated resource markup of the current application."""
+        return self._get_state().markup_cache.info()
+
+    def icon_cache_info(self) -> CacheInfo:
+        """Get the hit/miss statistics of the cache of rendered icon markup of the current application."""
+        info = self._get_state().cached_render_icon.cache_info()
+        return CacheInfo(info.hits, info.misses, info.maxsize or 0, info.currsize)
+
+    def _get_state(self) -> _AppState:
+        """Get the state of this extension instance for the current application (see `init_app`)."""
+        if not has_app_context():
+            return self._state
+        # bypass the proxy, as this is looked up for every rendered icon
+        app: Flask = current_app._get_current_object()  # type: ignore
+        return app.extensions.get("font_awesome_state", self._state)
+
+    @classmethod
+    def _get_assets(cls) -> _AssetState:
+        """Get the state of the local resources of the current application (or of the static folder of this package, outside of an application context)."""
+        if has_app_context():
+            state = current_app.extensions.get("font_awesome_state")
+            if state is not None:
+                return state.assets
+        return cls._assets
+
+    @classmethod
+    def _get_sri_map(cls, version: str, ext: str) -> Dict[str, Optional[str]]:
+        """Get the SRI hashes of the minified CDN resources of the given version and type, by style."""
+        return {
+            style: _get_cdn_sri(version, style, True, ext)
+            for style in (*cls.style_choices, cls.core_style)
+        }
+
+    @staticmethod
+    def _get_cache_dir() -> Optional[Path]:
+        """Get the configured cache directory (see `FONT_AWESOME_CACHE_DIR`), or `None` when the static folder of this package is used."""
+        if not has_app_context():
+            return None
+        cache_dir = current_app.config.get("FONT_AWESOME_CACHE_DIR")
+        return Path(cache_dir) if cache_dir is not None else None
 
     @staticmethod
+    def _get_download_settings() -> Dict[str, Any]:
+        """Get the configured download settings (see `downloads.DOWNLOAD_DEFAULTS`)."""
+        if not has_app_context():
+            return downloads.DOWNLOAD_DEFAULTS
+        return {
+            key: current_app.config.get(key, default)
+            for key, default in downloads.DOWNLOAD_DEFAULTS.items()
+        }
+
+    @classmethod
+    def _get_asset_folder(cls, version: str) -> Path:
+        """Get the folder of the local resources of the given version: its subdirectory of the cache directory, or the static folder of this package."""
+        cache_dir = cls._get_cache_dir()
+        if cache_dir is None:
+            return STATIC_FOLDER
+        return cache_dir / version
+
+    @classmethod
     def _get_file(
-        style: str, use_min: bool, ext: str, type: Optional[str] = None
+        cls,
+        version: str,
+        style: str,
+        use_min: bool,
+        ext: str,
+        type: Optional[str] = None,
     ) -> Path:
-        """Get the file path for the given style, extension, and possibly-minified suffix."""
+        """Get the file path for the given version, style, extension, and possibly-minified suffix."""
         possibly_min = ".min" if use_min else ""
         return (
-            STATIC_FOLDER
+            cls._get_asset_folder(version)
             / (type if type is not None else ext)
             / f"{style}{possibly_min}.{ext}"
         )
 
-    @staticmethod
+    @classmethod
+    def _get_local_url(cls, version: str, filename: str) -> str:
+        """Get the URL of the given local file of the given version."""
+        if cls._get_cache_dir() is None:
+            return url_for("font_awesome.static", filename=filename)
+        return url_for("font_awesome.cache", version=version, filename=filename)
+
+    @classmethod
     def _get_url(
+        cls,
         version: str,
         style: str,
         use_min: bool,
@@ -95,10 +512,18 @@ class FontAwesome:
         """Get the URL for the given version, style, extension, and possibly-minified suffix."""
         possibly_min = ".min" if use_min else ""
         if serve_local:
-            return url_for(
-                "font_awesome.static", filename=f"{ext}/{style}{possibly_min}.{ext}"
-            )
-        return CDN_URL_TEMPLATE.format(
+            if current_app.config["FONT_AWESOME_FINGERPRINT_URLS"]:
+                fingerprint = cls._get_fingerprint(
+                    cls._get_file(version, style, use_min, ext)
+                )
+                possibly_min += f".{fingerprint}"
+            return cls._get_local_url(version, f"{ext}/{style}{possibly_min}.{ext}")
+        cdn_url_template = (
+            current_app.config.get("FONT_AWESOME_CDN_URL_TEMPLATE", CDN_URL_TEMPLATE)
+            if has_app_context()
+            else CDN_URL_TEMPLATE
+        )
+        return cdn_url_template.format(
             version=version,
             type=type if type is not None else ext,
             style=style,
@@ -106,12 +531,139 @@ class FontAwesome:
             ext=ext,
         )
 
+    @classmethod
+    def _get_digest(cls, file: Path) -> bytes:
+        """Get the digest of the given file, cached by its (mtime, size) signature.
+
+        The digests are also stored in a manifest next to the static files (in the folder of their version), so that each file is only hashed once (typically when it is provisioned), rather than once per process.
+        """
+        assets = cls._load_digests(file.parents[1])
+        signature = cls._get_signature(file)
+        record_file(file, signature)
+        cached = assets.digests.get(file)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        digest = downloads.hash_file(file, SRI_ALGORITHM)
+        if signature is not None:
+            cls._set_digest(file, signature, digest)
+        return digest
+
+    @classmethod
+    def _load_digests(cls, folder: Path) -> _AssetState:
+        """Read the SRI manifest of the given folder into the digests of the current application, unless it has been read already.
+
+        Returns:
+            _AssetState: The state of the local resources of the current application.
+        """
+        assets = cls._get_assets()
+        with assets.digests_lock:
+            if folder not in assets.digests_loaded:
+                assets.digests.update(cls._read_digests(folder))
+                assets.digests_loaded.add(folder)
+        return assets
+
+    @staticmethod
+    def _read_digests(
+        folder: Path,
+    ) -> Dict[Path, Tuple[Tuple[int, int], bytes, Dict[str, str]]]:
+        """Read the (mtime, size) signatures, digests and download validators of the static files in the given folder from its SRI manifest."""
+        try:
+            manifest = json.loads((folder / SRI_MANIFEST).read_text())
+            return {
+                folder
+                / filename: (
+                    (entry["mtime_ns"], entry["size"]),
+                    base64.b64decode(entry[SRI_ALGORITHM]),
+                    dict(entry.get("validators", {})),
+                )
+                for filename, entry in manifest.items()
+                if SRI_ALGORITHM in entry
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}  # missing or corrupt, the digests are computed again
+
+    @classmethod
+    def _set_digest(
+        cls,
+        file: Path,
+        signature: Tuple[int, int],
+        digest: bytes,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Record the digest (and the download validators, if any) of the given file (in memory and in the SRI manifest)."""
+        folder = file.parents[1]
+        manifest_file = folder / SRI_MANIFEST
+        assets = cls._get_assets()
+        with assets.digests_lock, downloads.file_lock(
+            manifest_file.with_name(f".{manifest_file.name}.lock")
+        ):
+            # merge with the entries recorded by other processes in the meantime
+            digests = assets.digests
+            digests.update(cls._read_digests(folder))
+            digests[file] = (signature, digest, validators or {})
+            manifest = {
+                _file.relative_to(folder).as_posix(): {
+                    "mtime_ns": _signature[0],
+                    "size": _signature[1],
+                    SRI_ALGORITHM: base64.b64encode(_digest).decode(),
+                    **({"validators": _validators} if _validators else {}),
+                }
+                for _file, (_signature, _digest, _validators) in digests.items()
+                if folder in _file.parents
+            }
+            with downloads.atomic_write(manifest_file) as f:
+                f.write(json.dumps(manifest, indent=2, sort_keys=True).encode())
+
+    @classmethod
+    def _get_conditional_headers(cls, file: Path, url: str) -> Dict[str, str]:
+        """Get the headers that revalidate the given file (`If-None-Match` / `If-Modified-Since`), if it was downloaded from the given URL and is unchanged since."""
+        cached = cls._load_digests(file.parents[1]).digests.get(file)
+        if (
+            cached is None
+            or cached[0] != cls._get_signature(file)
+            or cached[2].get("url") != url
+        ):
+            return {}
+        headers = {}
+        if "etag" in cached[2]:
+            headers["If-None-Match"] = cached[2]["etag"]
+        if "last_modified" in cached[2]:
+            headers["If-Modified-Since"] = cached[2]["last_modified"]
+        return headers
+
+    @classmethod
+    def _get_fingerprint(cls, file: Path) -> str:
+        """Get the fingerprint (i.e. a short content hash) of the given file, see `FONT_AWESOME_FINGERPRINT_URLS`."""
+        return cls._get_digest(file).hex()[:10]
+
+    @classmethod
+    def _get_local_sri(cls, file: Path) -> str:
+        """Get the Subresource Integrity (SRI) hash of the given (local) file."""
+        return _format_sri(cls._get_digest(file))
+
+    @staticmethod
+    def _get_signature(file: Path) -> Optional[Tuple[int, int]]:
+        """Get the (mtime, size) signature of the given file, or `None` if it does not exist."""
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     @staticmethod
     def _get_version(file: Path) -> Optional[str]:
         """Get the version from the given file."""
         match = VERSION_PATTERN.search(file.read_text())
         return match.group(1) if match is not None else None
 
+    @staticmethod
+    def _invalidate_markup() -> None:
+        """Invalidate the markup cached for the current application, as a static file it may refer to was (re)written."""
+        if has_app_context():
+            state = current_app.extensions.get("font_awesome_state")
+            if state is not None:
+                state.invalidate_markup()
+
     @classmethod
     def _request_file(
         cls,
@@ -121,13 +673,69 @@ class FontAwesome:
         ext: str,
         file: Path,
         type: Optional[str] = None,
-    ) -> None:
-        """Request the file for serving locally."""
-        file.parent.mkdir(parents=True, exist_ok=True)
-        with urllib.request.urlopen(
-            cls._get_url(version, style, use_min, ext, False, type)
-        ) as response:
-            file.write_bytes(response.read())
+    ) -> bool:
+        """Request the file for serving locally.
+
+        Concurrent requests for the same file (from other threads or processes) are coordinated: only one of them downloads the file, while the others wait for it to finish. The file is streamed to a temporary file first and then atomically moved into place, so it is never read half-written. Its precompressed siblings are written along with it. When the file was downloaded from the same URL before (and is unchanged since), it is revalidated with a conditional request instead, and only downloaded again when it changed on the CDN.
+
+        Returns:
+            bool: Whether the file was downloaded (i.e. not when it was not modified on the CDN, or downloaded by another thread or process in the meantime).
+        """
+        signature = cls._get_signature(file)
+        with downloads.write_lock(file):
+            if cls._get_signature(file) != signature:
+                return False  # downloaded by another thread or process in the meantime
+            url = cls._get_url(version, style, use_min, ext, False, type)
+            headers = cls._get_conditional_headers(file, url)
+            instrumented = bool(
+                signals.download_started.receivers
+                or signals.download_finished.receivers
+                or signals.download_failed.receivers
+            )
+            if instrumented:
+                sender = signals._get_sender()
+                signals.download_started.send(sender, url=url, file=file)
+                start = time.perf_counter()
+            try:
+                result = downloads.download(
+                    url, file, SRI_ALGORITHM, cls._get_download_settings(), headers
+                )
+            except Exception as e:
+                if instrumented:
+                    signals.download_failed.send(
+                        sender,
+                        url=url,
+                        file=file,
+                        error=e,
+                        duration=time.perf_counter() - start,
+                    )
+                raise
+            if instrumented:
+                signals.download_finished.send(
+                    sender,
+                    url=url,
+                    file=file,
+                    size=result.size if result is not None else 0,
+                    duration=time.perf_counter() - start,
+                    modified=result is not None,
+                )
+            if result is None:
+                return False  # not modified
+            compression.write_compressed(file)
+            signature = cls._get_signature(file)
+            if signature is not None:
+                cls._set_digest(file, signature, result.digest, result.validators)
+            cls._invalidate_markup()
+            return True
+
+    @classmethod
+    def _get_webfont_styles(cls, style: str) -> List[str]:
+        """Get the webfont styles required by the CSS resource of the given style."""
+        if style == "all":
+            return [cls.webfonts_map[_style] for _style in cls.style_choices[1:]]
+        if style in cls.webfonts_map:
+            return [cls.webfonts_map[style]]
+        return []
 
     @classmethod
     def _request_webfont_files(
@@ -138,175 +746,919 @@ class FontAwesome:
         """Request the webfont files (ttf and woff2) for serving locally."""
         _type = "webfonts"
         for ext in ("ttf", "woff2"):
-            file = cls._get_file(webfont_style, False, ext, _type)
+            file = cls._get_file(version, webfont_style, False, ext, _type)
             cls._request_file(version, webfont_style, False, ext, file, _type)
 
+    @classmethod
+    def _is_provisioned(cls, version: str, style: str, use_min: bool, ext: str) -> bool:
+        """Check whether the file of the given version is available for serving locally.
+
+        The outcome of the (expensive) version check is cached per `(folder, version, style, use_min, ext)`, so the file is only re-scanned when its mtime or size changes on disk.
+        """
+        file = cls._get_file(version, style, use_min, ext)
+        key = (str(file.parents[1]), version, style, use_min, ext)
+        signature = cls._get_signature(file)
+        if signature is None:
+            return False
+        versions = cls._get_assets().versions
+        hit = versions.get(key) == signature
+        if signals.version_checked.receivers:
+            signals.version_checked.send(
+                signals._get_sender(), file=file, version=version, hit=hit
+            )
+        if hit:
+            return True
+        if cls._get_version(file) != version:
+            return False
+        versions[key] = signature
+        return True
+
     @classmethod
     def _possibly_request_file(
-        cls, version: str, style: str, use_min: bool, ext: str
+        cls, version: str, style: str, use_min: bool, ext: str, download: bool = True
     ) -> None:
-        """Possibly request the file for serving locally."""
-        file = cls._get_file(style, use_min, ext)
-        if not file.exists() or cls._get_version(file) != version:
-            cls._request_file(version, style, use_min, ext, file)
-            if ext == "css":  # also request webfonts
-                if style == "all":
-                    for _style in cls.style_choices[1:]:
-                        webfont_style = cls.webfonts_map[_style]
-                        cls._request_webfont_files(version, webfont_style)
-                else:
-                    webfont_style = cls.webfonts_map[style]
-                    cls._request_webfont_files(version, webfont_style)
+        """Possibly request the file for serving locally.
+
+        Raises:
+            FileNotFoundError: When the file is not (yet) available locally and `download` is `False`.
+        """
+        file = cls._get_file(version, style, use_min, ext)
+        cls._record_access(file.parents[1])
+        if cls._is_provisioned(version, style, use_min, ext):
+            return
+        if not download:
+            raise FileNotFoundError(
+                f"{file} is missing or not of version {version}. Run `flask font-awesome fetch` to provision it."
+            )
+        cls._request_file(version, style, use_min, ext, file)
+        if ext == "css":  # also request webfonts
+            for webfont_style in cls._get_webfont_styles(style):
+                cls._request_webfont_files(version, webfont_style)
+        cls._is_provisioned(version, style, use_min, ext)
+        cls._evict_cache(version)
+
+    @classmethod
+    def _record_access(cls, folder: Path) -> None:
+        """Record that the resources in the given version folder of the cache directory are in use (see `FONT_AWESOME_CACHE_MAX_SIZE`).
+
+        The access marker of each folder is updated at most once every `CACHE_ACCESS_INTERVAL` seconds per application and process.
+        """
+        if folder == STATIC_FOLDER:
+            return
+        now = time.monotonic()
+        assets = cls._get_assets()
+        accessed = assets.accessed.get(folder)
+        if accessed is not None and now - accessed < CACHE_ACCESS_INTERVAL:
+            return
+        assets.accessed[folder] = now
+        with contextlib.suppress(OSError):
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / CACHE_ACCESS_MARKER).touch()
+
+    @classmethod
+    def _evict_cache(cls, version: str) -> List[Path]:
+        """Remove the least recently used versions from the cache directory until it fits in `FONT_AWESOME_CACHE_MAX_SIZE` (never the given version, which is in use).
+
+        Returns:
+            List[pathlib.Path]: The removed version folders.
+        """
+        cache_dir = cls._get_cache_dir()
+        if cache_dir is None:
+            return []
+        max_size = current_app.config.get("FONT_AWESOME_CACHE_MAX_SIZE")
+        if max_size is None:
+            return []
+        removed = []
+        with downloads.file_lock(cache_dir / ".eviction.lock"):
+            folders = []
+            for folder in cache_dir.iterdir():
+                if not folder.is_dir():
+                    continue
+                size = 0
+                for root, _, filenames in os.walk(folder):
+                    for filename in filenames:
+                        with contextlib.suppress(OSError):
+                            size += os.stat(os.path.join(root, filename)).st_size
+                marker = cls._get_signature(folder / CACHE_ACCESS_MARKER)
+                folders.append((marker[0] if marker is not None else 0, size, folder))
+            total_size = sum(size for _, size, _ in folders)
+            for _, size, folder in sorted(folders):
+                if total_size <= max_size:
+                    break
+                if folder.name == version:
+                    continue
+                shutil.rmtree(folder, ignore_errors=True)
+                cls._get_assets().accessed.pop(folder, None)
+                total_size -= size
+                removed.append(folder)
+        return removed
+
+    @classmethod
+    def provision(  # noqa: C901
+        cls,
+        version: Optional[str] = None,
+        styles: Sequence[str] = (style,),
+        use_min: bool = use_min,
+        exts: Sequence[str] = ("css", "js"),
+        max_workers: Optional[int] = None,
+        force: bool = False,
+    ) -> Dict[Path, bool]:
+        """Download Font Awesome's resources for serving locally ahead of time.
+
+        Every file required by :meth:`load_css` / :meth:`load_js` for the given styles (including the core resource and webfonts) is downloaded from the CDN in parallel. Combined with `FONT_AWESOME_DOWNLOAD_ON_DEMAND = False`, requests then never have to touch the network. This is also available from the command line as `flask font-awesome fetch`.
+
+        Some examples:
+            >>> FontAwesome.provision()
+            >>> FontAwesome.provision(styles=("solid", "brands"), exts=("css",))
+
+        Args:
+            version (Optional[str]): The version to provision. Defaults to the latest version.
+            styles (Sequence[str]): The `icon styles <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to provision. Defaults to `("all",)`.
+            use_min (bool): Whether to provision the minified resources or not. Defaults to `True`.
+            exts (Sequence[str]): The resource types to provision, `css` (WebFonts + CSS) and/or `js` (SVG + JS). Defaults to both.
+            max_workers (Optional[int]): The maximum number of parallel downloads. Defaults to the :class:`~concurrent.futures.ThreadPoolExecutor` default.
+            force (bool): Whether to download files that are already available locally as well. Defaults to `False`.
+
+        Raises:
+            ValueError: When trying to provision a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`)
+
+        Returns:
+            Dict[pathlib.Path, bool]: The files requested from the CDN, and whether they were downloaded (`False` when they were revalidated instead, as they were not modified on the CDN).
+        """
+        version = version or cls.version
+        for style in styles:
+            if style not in cls.style_choices:
+                raise ValueError(
+                    f"`style` must be one of {', '.join(cls.style_choices)}"
+                )
+
+        # collect the (style, use_min, ext, type) of every file that needs to be downloaded
+        requests: Dict[Path, Tuple[str, bool, str, Optional[str]]] = {}
+        provisioned: Set[Path] = set()
+        for ext in exts:
+            for style in styles:
+                main_styles = [style] if style == "all" else [style, cls.core_style]
+                for main_style in main_styles:
+                    file = cls._get_file(version, main_style, use_min, ext)
+                    if force or not cls._is_provisioned(
+                        version, main_style, use_min, ext
+                    ):
+                        requests[file] = (main_style, use_min, ext, None)
+                    else:
+                        provisioned.add(file)
+                if ext == "css":
+                    stale = cls._get_file(version, style, use_min, ext) in requests
+                    for webfont_style in cls._get_webfont_styles(style):
+                        for webfont_ext in ("ttf", "woff2"):
+                            file = cls._get_file(
+                                version, webfont_style, False, webfont_ext, "webfonts"
+                            )
+                            if stale or not file.exists():
+                                requests[file] = (
+                                    webfont_style,
+                                    False,
+                                    webfont_ext,
+                                    "webfonts",
+                                )
+                            else:
+                                provisioned.add(file)
+
+        # files that are already available only lack their precompressed siblings and digests (if anything)
+        uncompressed = [
+            file
+            for file in provisioned
+            if not all(
+                compression.get_compressed(file, coding)
+                for coding in compression.CONTENT_CODINGS
+            )
+        ]
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            # download within (a copy of) the current context, i.e. with the configuration of the current application
+            downloaded = {
+                file: executor.submit(
+                    contextvars.copy_context().run,
+                    cls._request_file,
+                    version,
+                    _style,
+                    _use_min,
+                    _ext,
+                    file,
+                    _type,
+                )
+                for file, (_style, _use_min, _ext, _type) in requests.items()
+            }
+            futures: List[Future[Any]] = list(downloaded.values())
+            futures.extend(
+                executor.submit(compression.write_compressed, file)
+                for file in uncompressed
+            )
+            futures.extend(
+                executor.submit(cls._get_digest, file) for file in provisioned
+            )
+            for future in futures:
+                future.result()
+
+        # record the version check of the freshly downloaded files
+        for _style, _use_min, _ext, _type in requests.values():
+            if _type is None:
+                cls._is_provisioned(version, _style, _use_min, _ext)
+        if requests:
+            cls._record_access(cls._get_asset_folder(version))
+            cls._evict_cache(version)
+        return {file: future.result() for file, future in downloaded.items()}
+
+    @classmethod
+    def build_subset(
+        cls,
+        icons: Iterable[str],
+        version: Optional[str] = None,
+        use_min: bool = use_min,
+        webfonts: bool = False,
+    ) -> Dict[str, Path]:
+        """Build SVG + JS and WebFonts + CSS resources that only contain the given icons, for serving locally.
+
+        The SVG + JS resource combines the core resource with the definitions of the given icons only, and the WebFonts + CSS resource combines the style resources of the given icons with the core resource without the rules of any other icons. With `webfonts`, the webfonts are subset to the glyphs of the given icons as well (from the local, full webfonts), and the WebFonts + CSS resource uses these instead. With `FONT_AWESOME_USE_SUBSET` enabled, :meth:`load_css` / :meth:`load_js` load these resources (with their SRI) instead. This is also available from the command line as `flask font-awesome subset`.
+
+        Some examples:
+            >>> FontAwesome.build_subset(["fas fa-house", "fa-brands fa-github"])
+            >>> FontAwesome.build_subset(["fas fa-house"], webfonts=True)
+
+        Args:
+            icons (Iterable[str]): The names of the icons to include (e.g. `fa-solid fa-house`).
+            version (Optional[str]): The version of the core resources to build upon (whose icons are included). Defaults to the latest version.
+            use_min (bool): Whether to use the minified core resources or not. Defaults to `True`.
+            webfonts (bool): Whether to subset the webfonts as well (requires `fontTools <https://pypi.org/project/fonttools/>`_). Defaults to `False`.
+
+        Raises:
+            ValueError: When one of the icons is unknown.
+            ImportError: When subsetting the webfonts without fontTools installed.
+
+        Returns:
+            Dict[str, pathlib.Path]: The built resources, by type (`css` and `js`) and by webfont (e.g. `fa-solid-900`).
+        """
+        version = version or cls.version
+        icon_index = cls._get_icon_index(version)
+        requested: Dict[Icon, Set[str]] = {}
+        for name in icons:
+            icon, alias, _ = icon_index.find(name)
+            requested.setdefault(icon, {icon.name}).add(alias)
+        styles = sorted({icon.style for icon in requested})
+
+        for ext in ("css", "js"):
+            cls._possibly_request_file(version, cls.core_style, use_min, ext)
+        for style in styles:
+            cls._possibly_request_file(version, style, use_min, "css")
+
+        # webfont -> name of its subset (e.g. `fa-solid-900` -> `subset-fa-solid-900`) and content
+        fonts: Dict[str, Tuple[str, bytes]] = {}
+        if webfonts:
+            for style in styles:
+                for webfont in cls._get_webfont_styles(style):
+                    unicodes = {
+                        int(icon.unicode, 16)
+                        for icon in requested
+                        if icon.style == style
+                    }
+                    fonts[webfont] = (
+                        f"{SUBSET_STYLE}-{webfont}",
+                        subset.build_font(
+                            cls._get_webfont(version, webfont).read_bytes(), unicodes
+                        ),
+                    )
+
+        core_js = cls._get_file(version, cls.core_style, use_min, "js").read_text()
+        core_css = cls._get_file(version, cls.core_style, use_min, "css").read_text()
+        contents = {
+            "js": subset.build_js(requested, core_js),
+            "css": "\n".join(
+                [
+                    subset.replace_fonts(
+                        cls._get_file(version, style, use_min, "css").read_text(),
+                        {webfont: name for webfont, (name, _) in fonts.items()},
+                    )
+                    for style in styles
+                ]
+                + [subset.trim_css(core_css, set().union(*requested.values()))]
+            ),
+        }
+
+        files = {}
+        manifest: Dict[str, Any] = {
+            "version": version,
+            "use_min": use_min,
+            "icons": sorted(f"{icon.style}:{icon.name}" for icon in requested),
+            "sri": {},
+            "webfonts": {webfont: name for webfont, (name, _) in fonts.items()},
+        }
+        for webfont, (name, data) in fonts.items():
+            files[webfont] = cls._get_file(version, name, False, "woff2", "webfonts")
+            with downloads.atomic_write(files[webfont]) as f:
+                f.write(data)
+        for ext, content in contents.items():
+            files[ext] = cls._get_file(version, SUBSET_STYLE, use_min, ext)
+            data = content.encode()
+            with downloads.atomic_write(files[ext]) as f:
+                f.write(data)
+            compression.write_compressed(files[ext], data)
+            manifest["sri"][ext] = _get_sri(data)
+        with downloads.atomic_write(
+            cls._get_asset_folder(version) / SUBSET_MANIFEST
+        ) as f:
+            f.write(json.dumps(manifest, indent=2).encode())
+        cls._invalidate_markup()
+        return files
+
+    @classmethod
+    def _get_icon_index(cls, version: str) -> IconIndex:
+        """Get the index of the icons of the given version, extracted from its own SVG + JS resource (downloading it if necessary)."""
+        cls._possibly_request_file(version, "all", True, "js")
+        source = cls._get_file(version, "all", True, "js")
+        icon_index = cls._get_assets().icon_index
+        if source == icon_index.source:
+            return icon_index
+        # next to the resource, i.e. in the folder of its version
+        return IconIndex(source, source.with_name(f"{source.name}.idx"))
+
+    @classmethod
+    def _get_webfont(cls, version: str, webfont: str) -> Path:
+        """Get the local (full) file of the given webfont, preferring `ttf` over `woff2` (which requires Brotli to read), downloading it if necessary."""
+        for ext in ("ttf", "woff2"):
+            file = cls._get_file(version, webfont, False, ext, "webfonts")
+            if file.exists():
+                return file
+        cls._request_webfont_files(version, webfont)
+        return cls._get_file(version, webfont, False, "ttf", "webfonts")
+
+    def _load_subset(self, version: str, ext: str) -> Tuple[Markup, Tuple[str, ...]]:
+        """Generate the markup (and the preload `Link` header values) for the subset resource of the given type (see :meth:`build_subset`), from the folder of the given version."""
+        manifest_file = self._get_asset_folder(version) / SUBSET_MANIFEST
+        if not manifest_file.exists():
+            raise FileNotFoundError(
+                f"{manifest_file} is missing. Run `flask font-awesome subset` to build the subset resources."
+            )
+        record_file(manifest_file, self._get_signature(manifest_file))
+        manifest = json.loads(manifest_file.read_text())
+        url = self._get_url(
+            manifest["version"], SUBSET_STYLE, manifest["use_min"], ext, True
+        )
+        styles = sorted({icon.split(":")[0] for icon in manifest["icons"]})
+        webfonts = [
+            manifest.get("webfonts", {}).get(webfont, webfont)
+            for style in styles
+            for webfont in self._get_webfont_styles(style)
+        ]
+        return self._get_markup(
+            ext, manifest["version"], webfonts, True, [(url, manifest["sri"][ext])]
+        )
 
     def load(
         self,
-        version: str = version,
-        style: str = style,
-        css_sri: str = css_sri_map[style],
-        core_css_sri: str = css_sri_map[core_style],
-        js_sri: str = js_sri_map[style],
-        core_js_sri: str = js_sri_map[core_style],
+        version: Optional[str] = None,
+        style: Union[str, Sequence[str]] = style,
+        css_sri: Optional[str] = None,
+        core_css_sri: Optional[str] = None,
+        js_sri: Optional[str] = None,
+        core_js_sri: Optional[str] = None,
         use_min: bool = use_min,
         use_css: bool = use_css,
     ) -> Markup:
-        """Load Font Awesome's `WebFonts + CSS <https://fontawesome.com/docs/web/setup/host-yourself/webfonts>`_ / `SVG + JS <https://fontawesome.com/docs/web/setup/host-yourself/svg-js>`_ resources for the given version. Defaults to `SVG + JS`.
+        """Load Font Awesome's `WebFonts + CSS <https://fontawesome.com/docs/web/setup/host-yourself/webfonts>`_ / `SVG + JS <https://fontawesome.com/docs/web/setup/host-yourself/svg-js>`_ resources for the given version. Defaults to `SVG + JS`. When `FONT_AWESOME_RENDER_MODE` is `svg` or `sprite`, only the CSS for the inline SVG icons is loaded (see :meth:`load_svg_css`).
 
         Some examples:
             >>> font_awesome.load()
             >>> font_awesome.load(style="solid", use_css=True)
-            >>> font_awesome.load(
-            ...     version="5.9.0",
-            ...     js_sri="sha512-q3eWabyZPc1XTCmF+8/LuE1ozpg5xxn7iO89yfSOd5/oKvyqLngoNGsx8jq92Y8eXJ/IRxQbEC+FGSYxtk2oiw=="
-            ... )
+            >>> font_awesome.load(version="6.4.2", js_sri="sha512-...")
+            >>> font_awesome.load(style=["solid", "brands"])
 
         Args:
-            version (str): The version to load. Defaults to `6.2.0`.
-            style (str): The `icon style(s) <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to load. Defaults to `all`.
-            css_sri (str): The `Subresource Integrity (SRI) <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the CSS resource file when not served locally. Defaults to `sha512-xh6O/CkQoPOWDdYTDqeRdPCVd1SpvCA9XXcUnZS2FmJNp1coAFzvtCN9BmamE+4aHK8yyUHUSCcJHgXloTyT2A==`.
-            core_css_sri (str): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core CSS resource file when not served locally. Defaults to `sha512-uj2QCZdpo8PSbRGL/g5mXek6HM/APd7k/B5Hx/rkVFPNOxAQMXD+t+bG4Zv8OAdUpydZTU3UHmyjjiHv2Ww0PA==`.
-            js_sri (str): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the JS resource file when not served locally. Defaults to `sha512-naukR7I+Nk6gp7p5TMA4ycgfxaZBJ7MO5iC3Fp6ySQyKFHOGfpkSZkYVWV5R7u7cfAicxanwYQ5D1e17EfJcMA==`.
-            core_js_sri (str): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core JS resource file when not served locally. Defaults to `sha512-j3gF1rYV2kvAKJ0Jo5CdgLgSYS7QYmBVVUjduXdoeBkc4NFV4aSRTi+Rodkiy9ht7ZYEwF+s09S43Z1Y+ujUkA==`.
+            version (Optional[str]): The version to load. Defaults to the latest version.
+            style (Union[str, Sequence[str]]): The `icon style(s) <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to load, e.g. `solid` or `["solid", "brands"]`. Defaults to `all`.
+            css_sri (Optional[str]): The `Subresource Integrity (SRI) <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the CSS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
+            core_css_sri (Optional[str]): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core CSS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
+            js_sri (Optional[str]): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the JS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
+            core_js_sri (Optional[str]): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core JS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
             use_min (bool): Whether to use the minified resource or not. Defaults to `True`.
             use_css (bool): Whether to use `WebFonts + CSS <https://fontawesome.com/docs/web/setup/host-yourself/webfonts>`_ over `SVG + JS <https://fontawesome.com/docs/web/setup/host-yourself/svg-js>`_. Defaults to `False`.
 
         Raises:
-            ValueError: When trying to load a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`)
+            ValueError: When trying to load a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`), or a `style` other than `all` with `FONT_AWESOME_USE_SUBSET` enabled (the subset resources contain the styles of their icons).
+            FileNotFoundError: When serving locally with `FONT_AWESOME_DOWNLOAD_ON_DEMAND` disabled and the resource(s) have not been provisioned.
 
         Returns:
             flask.Markup: The HTML markup for the WebFonts + CSS / SVG + JS resource(s).
         """
+        if current_app.config["FONT_AWESOME_RENDER_MODE"] in SVG_RENDER_MODES:
+            return self.load_svg_css()
         if use_css:
-            return self.load_css(style, version, css_sri, core_css_sri, use_min)
-        return self.load_js(style, version, js_sri, core_js_sri, use_min)
+            return self.load_css(
+                version=version,
+                style=style,
+                sri=css_sri,
+                core_sri=core_css_sri,
+                use_min=use_min,
+            )
+        return self.load_js(
+            version=version,
+            style=style,
+            sri=js_sri,
+            core_sri=core_js_sri,
+            use_min=use_min,
+        )
 
     def load_css(
         self,
-        version: str = version,
-        style: str = style,
-        sri: str = css_sri_map[style],
-        core_sri: str = css_sri_map[core_style],
+        version: Optional[str] = None,
+        style: Union[str, Sequence[str]] = style,
+        sri: Optional[str] = None,
+        core_sri: Optional[str] = None,
         use_min: bool = use_min,
     ) -> Markup:
         """Load Font Awesome's `WebFonts + CSS <https://fontawesome.com/docs/web/setup/host-yourself/webfonts>`_ resources for the given version.
 
+        When serving locally, the SRI hashes are computed from the local files (once per file, see :meth:`provision`).
+
         Some examples:
             >>> font_awesome.load_css()
             >>> font_awesome.load_css(style="regular")
 
         Args:
-            version (str): The version to load. Defaults to `6.2.0`.
-            style (str): The `icon style(s) <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to load. Defaults to `all`.
-            sri (str): The `Subresource Integrity (SRI) <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the CSS resource file when not served locally. Defaults to `sha512-xh6O/CkQoPOWDdYTDqeRdPCVd1SpvCA9XXcUnZS2FmJNp1coAFzvtCN9BmamE+4aHK8yyUHUSCcJHgXloTyT2A==`.
-            core_sri (str): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core CSS resource file when not served locally. Defaults to `sha512-uj2QCZdpo8PSbRGL/g5mXek6HM/APd7k/B5Hx/rkVFPNOxAQMXD+t+bG4Zv8OAdUpydZTU3UHmyjjiHv2Ww0PA==`.
+            version (Optional[str]): The version to load. Defaults to the latest version.
+            style (Union[str, Sequence[str]]): The `icon style(s) <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to load, e.g. `solid` or `["solid", "brands"]`. Defaults to `all`.
+            sri (Optional[str]): The `Subresource Integrity (SRI) <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the CSS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
+            core_sri (Optional[str]): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core CSS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
             use_min (bool): Whether to use the minified resources or not. Defaults to `True`.
 
         Raises:
-            ValueError: When trying to load a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`)
+            ValueError: When trying to load a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`), or a `style` other than `all` with `FONT_AWESOME_USE_SUBSET` enabled (the subset resources contain the styles of their icons).
+            FileNotFoundError: When serving locally with `FONT_AWESOME_DOWNLOAD_ON_DEMAND` disabled and the resource(s) have not been provisioned.
+            OSError: When serving locally with `FONT_AWESOME_CDN_FALLBACK` disabled and downloading the resource(s) failed.
 
         Returns:
             flask.Markup: The HTML markup for the WebFonts + CSS resources.
         """
-        if style not in self.style_choices:
-            raise ValueError(f"`style` must be one of {', '.join(self.style_choices)}")
-
-        serve_local = current_app.config["FONT_AWESOME_SERVE_LOCAL"]
-        ext = "css"
-
-        url = self._get_url(version, style, use_min, ext, serve_local)
-        if serve_local:
-            self._possibly_request_file(version, style, use_min, ext)
-            css = f'<link rel="stylesheet" href="{url}" />'
-        else:
-            css = f'<link rel="stylesheet" href="{url}" integrity="{sri}" crossorigin="anonymous" />'
-
-        if style != "all":
-            core_url = self._get_url(
-                version, self.core_style, use_min, ext, serve_local
-            )
-            if serve_local:
-                self._possibly_request_file(version, self.core_style, use_min, ext)
-                css += f'\n<link rel="stylesheet" href="{core_url}" />'
-            else:
-                css += f'\n<link rel="stylesheet" href="{core_url}" integrity="{core_sri}" crossorigin="anonymous" />'
-
-        return Markup(css)
+        return self._load_cached("css", version, style, sri, core_sri, use_min)
 
     def load_js(
         self,
-        version: str = version,
-        style: str = style,
-        sri: str = js_sri_map[style],
-        core_sri: str = js_sri_map[core_style],
+        version: Optional[str] = None,
+        style: Union[str, Sequence[str]] = style,
+        sri: Optional[str] = None,
+        core_sri: Optional[str] = None,
         use_min: bool = use_min,
     ) -> Markup:
         """Load Font Awesome's `SVG + JS <https://fontawesome.com/docs/web/setup/host-yourself/svg-js>`_ resource for the given version.
 
+        When serving locally, the SRI hashes are computed from the local files (once per file, see :meth:`provision`).
+
         Some examples:
             >>> font_awesome.load_js()
-            >>> font_awesome.load_js(
-            ...     use_min=False,
-            ...     sri="sha512-8XtSBQOB+R4dpcpQBpYC5Q7ti7y/MjIF0l/1ZiSd4xM04Dr052S/Py981Pzmwo2HrXCR2JhYE1MYR15aZGMnig=="
-            ... )
+            >>> font_awesome.load_js(version="6.4.2", sri="sha512-...", use_min=False)
 
         Args:
-            version (str): The version to load. Defaults to `6.2.0`.
-            style (str): The `icon style(s) <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to load. Defaults to `all`.
-            sri (str): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the JS resource file when not served locally. Defaults to `sha512-naukR7I+Nk6gp7p5TMA4ycgfxaZBJ7MO5iC3Fp6ySQyKFHOGfpkSZkYVWV5R7u7cfAicxanwYQ5D1e17EfJcMA==`.
-            core_sri (str): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core JS resource file when not served locally. Defaults to `sha512-j3gF1rYV2kvAKJ0Jo5CdgLgSYS7QYmBVVUjduXdoeBkc4NFV4aSRTi+Rodkiy9ht7ZYEwF+s09S43Z1Y+ujUkA==`.
+            version (Optional[str]): The version to load. Defaults to the latest version.
+            style (Union[str, Sequence[str]]): The `icon style(s) <https://fontawesome.com/v6/docs/web/dig-deeper/styles>`_ to load, e.g. `solid` or `["solid", "brands"]`. Defaults to `all`.
+            sri (Optional[str]): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the JS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
+            core_sri (Optional[str]): The `SRI <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_ for the core JS resource file when not served locally. Defaults to the SRI hash of the given version from the version manifest (if known).
             use_min (bool): Whether to use the minified resource or not. Defaults to `True`.
 
         Raises:
-            ValueError: When trying to load a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`)
+            ValueError: When trying to load a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`), or a `style` other than `all` with `FONT_AWESOME_USE_SUBSET` enabled (the subset resources contain the styles of their icons).
+            FileNotFoundError: When serving locally with `FONT_AWESOME_DOWNLOAD_ON_DEMAND` disabled and the resource(s) have not been provisioned.
+            OSError: When serving locally with `FONT_AWESOME_CDN_FALLBACK` disabled and downloading the resource(s) failed.
 
         Returns:
             flask.Markup: The HTML markup for the SVG + JS resource.
         """
-        if style not in self.style_choices:
-            raise ValueError(f"`style` must be one of {', '.join(self.style_choices)}")
+        return self._load_cached("js", version, style, sri, core_sri, use_min)
+
+    def _load_cached(
+        self,
+        ext: str,
+        version: Optional[str],
+        style: Union[str, Sequence[str]],
+        sri: Optional[str],
+        core_sri: Optional[str],
+        use_min: bool,
+    ) -> Markup:
+        """Load the resources for :meth:`load_css` / :meth:`load_js` through the markup cache.
+
+        When serving locally and the resources can't be provisioned (yet), they are loaded from the CDN instead (see `FONT_AWESOME_CDN_FALLBACK` and `FONT_AWESOME_DOWNLOAD_IN_BACKGROUND`). This markup is not cached, so the local resources are loaded again as soon as they are available.
+        """
+        styles = self._get_styles(style)
+        version = version or self.version
+        # the (per application) markup cache is cleared when the configuration changes, see `clear_cache`
+        key = (
+            ext,
+            version,
+            styles,
+            sri,
+            core_sri,
+            use_min,
+            request.script_root if has_request_context() else None,
+        )
+        try:
+            markup, links = self._get_cached_markup(key)
+        except FileNotFoundError:
+            if not self._download_in_background(ext, version, styles, use_min):
+                raise
+            markup, links = self._load(
+                ext, version, styles, sri, core_sri, use_min, serve_local=False
+            )
+        except OSError as e:
+            if not self._get_state().config["FONT_AWESOME_CDN_FALLBACK"]:
+                raise
+            current_app.logger.warning(
+                "Failed to provision Font Awesome %s for serving locally, loading it from the CDN instead: %s",
+                version,
+                e,
+            )
+            markup, links = self._load(
+                ext, version, styles, sri, core_sri, use_min, serve_local=False
+            )
+        self._add_preload_links(links)
+        self._mark_loaded()
+        return markup
+
+    def _mark_loaded(self) -> None:
+        """Record that resources were loaded explicitly while handling the current request, so they are not injected as well (see `FONT_AWESOME_AUTO_INJECT`)."""
+        if injection.rendered_icons.get() is not None and has_request_context():
+            g._font_awesome_loaded = True
+
+    def _get_injected_markup(self) -> Optional[bytes]:
+        """Get the markup of the resources needed by the icons rendered while handling the current request (see `FONT_AWESOME_AUTO_INJECT`), unless there are none or resources were loaded explicitly."""
+        if g.get("_font_awesome_loaded"):
+            return None
+        names = injection.rendered_icons.get()
+        injection.rendered_icons.set(None)
+        if not names:
+            return None
+        styles = {parse_icon_name(name)[0] for name in names}
+        styles.intersection_update(self.style_choices)
+        if not styles:
+            return None
+        config = self._get_state().config
+        if config["FONT_AWESOME_SERVE_LOCAL"] and config["FONT_AWESOME_USE_SUBSET"]:
+            return (self.load() + "\n").encode()  # the subset contains all styles used
+        return (self.load(style=sorted(styles)) + "\n").encode()
+
+    def _inject_resources(self, response: Response) -> Response:
+        """Inject the resources needed by the icons rendered while handling the current request into its HTML response (see `FONT_AWESOME_AUTO_INJECT`).
+
+        They are injected before `</head>` (or before `</body>`, without a `</head>` tag). The body of a streamed response is passed through as it is generated instead, and the resources are injected before its `</body>` tag (accounting for the icons rendered until then).
+        """
+        if (
+            response.mimetype != "text/html"
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or (response.is_streamed and "Content-Length" in response.headers)
+        ):
+            injection.rendered_icons.set(None)
+            return response
+        if response.is_streamed:
+            response.response = injection.inject_into_stream(
+                response.response, self._get_streamed_injected_markup
+            )
+            return response
+        markup = self._get_injected_markup()
+        if markup is not None:
+            response.set_data(injection.inject(response.get_data(), markup))
+        return response
+
+    def _get_streamed_injected_markup(self) -> Optional[bytes]:
+        """Get the markup to inject into a streamed response (see :meth:`_get_injected_markup`), once its `</body>` tag is reached."""
+        # the request context is available while streaming with `stream_with_context` (e.g. `stream_template`)
+        return self._get_injected_markup() if has_request_context() else None
+
+    def _download_in_background(
+        self, ext: str, version: str, styles: Tuple[str, ...], use_min: bool
+    ) -> bool:
+        """Provision the given resources for serving locally in a background thread, if enabled (see `FONT_AWESOME_DOWNLOAD_IN_BACKGROUND`).
+
+        Returns:
+            bool: Whether the resources are (being) downloaded in the background.
+        """
+        config = self._get_state().config
+        if not (
+            config["FONT_AWESOME_DOWNLOAD_ON_DEMAND"]
+            and config["FONT_AWESOME_DOWNLOAD_IN_BACKGROUND"]
+        ):
+            return False
+        key = (str(self._get_asset_folder(version)), version, styles, use_min, ext)
+        app = current_app._get_current_object()  # type: ignore
+
+        def provision() -> None:
+            with app.app_context():
+                try:
+                    self._provision_resources(version, styles, use_min, ext, True)
+                except Exception:
+                    app.logger.exception(
+                        "Failed to provision Font Awesome %s in the background", version
+                    )
+                finally:
+                    with FontAwesome._background_lock:
+                        FontAwesome._background_downloads.pop(key, None)
+
+        with FontAwesome._background_lock:
+            if key not in FontAwesome._background_downloads:
+                if FontAwesome._background_executor is None:
+                    FontAwesome._background_executor = ThreadPoolExecutor(
+                        1, thread_name_prefix="font-awesome"
+                    )
+                FontAwesome._background_downloads[key] = (
+                    FontAwesome._background_executor.submit(provision)
+                )
+        return True
+
+    def _get_cached_markup(
+        self, key: Tuple[Any, ...]
+    ) -> Tuple[Markup, Tuple[str, ...]]:
+        """Get the resource markup (and preload links) for the given key (the arguments of :meth:`_load` and the script root of the current request) from the markup cache, generating it on a miss.
+
+        The markup is generated again when one of the local files it was generated from (e.g. to compute their SRI hashes) has changed since, as they may be replaced by other processes (e.g. `flask font-awesome fetch --force`).
+        """
+        state = self._get_state()
+        if not signals.markup_cache_accessed.receivers:
+            entry = state.markup_cache.get_or_set(
+                key, self._generate_markup, state.is_valid_markup
+            )
+            return entry[0], entry[1]
+        misses = []
+
+        def generate(key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+            misses.append(key)
+            return self._generate_markup(key)
+
+        entry = state.markup_cache.get_or_set(key, generate, state.is_valid_markup)
+        signals.markup_cache_accessed.send(
+            signals._get_sender(), key=key, hit=not misses
+        )
+        return entry[0], entry[1]
+
+    def _generate_markup(
+        self, key: Tuple[Any, ...]
+    ) -> Tuple[Markup, Tuple[str, ...], Tuple[Any, ...], int]:
+        """Generate a markup cache entry for the given key (see :meth:`_get_cached_markup`): the markup, the preload links, the local files it was generated from and the generation of the cache it was generated for."""
+        # read first, so the entry is invalid when a static file is written while generating it
+        generation = self._get_state().generation
+        with recording_files() as files:
+            markup, links = self._load(*key[:6])
+        return markup, links, tuple(files.items()), generation
+
+    @classmethod
+    def _get_styles(cls, style: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        """Get the distinct icon style(s) to load for the given style (or styles), reduced to `all` when it is among them.
 
-        serve_local = current_app.config["FONT_AWESOME_SERVE_LOCAL"]
-        ext = "js"
+        Raises:
+            ValueError: When one of the styles is a non-free icon style (i.e. not one of `all`, `regular`, `solid`, or `brands`)
+        """
+        styles = (style,) if isinstance(style, str) else tuple(dict.fromkeys(style))
+        if not styles or any(_style not in cls.style_choices for _style in styles):
+            raise ValueError(f"`style` must be one of {', '.join(cls.style_choices)}")
+        if "all" in styles:
+            return ("all",)
+        return styles
 
-        url = self._get_url(version, style, use_min, ext, serve_local)
+    def _load(
+        self,
+        ext: str,
+        version: str,
+        styles: Tuple[str, ...],
+        sri: Optional[str],
+        core_sri: Optional[str],
+        use_min: bool,
+        serve_local: Optional[bool] = None,
+    ) -> Tuple[Markup, Tuple[str, ...]]:
+        """Generate the markup (and the preload `Link` header values) for :meth:`load_css` / :meth:`load_js`, serving locally as configured unless `serve_local` is given."""
+        config = self._get_state().config
+        if serve_local is None:
+            serve_local = config["FONT_AWESOME_SERVE_LOCAL"]
+        if serve_local and config["FONT_AWESOME_USE_SUBSET"]:
+            if styles != ("all",):
+                raise ValueError(
+                    "`style` is not supported with `FONT_AWESOME_USE_SUBSET`, as the subset resources contain the styles of their icons"
+                )
+            return self._load_subset(version, ext)
         if serve_local:
-            self._possibly_request_file(version, style, use_min, ext)
-            js = f'<script defer src="{url}"></script>'
+            # when downloading in the background, only the resources that are available already are served locally
+            download = (
+                config["FONT_AWESOME_DOWNLOAD_ON_DEMAND"]
+                and not config["FONT_AWESOME_DOWNLOAD_IN_BACKGROUND"]
+            )
+            resources = self._provision_resources(
+                version, styles, use_min, ext, download
+            )
         else:
-            js = f'<script defer src="{url}" integrity="{sri}" crossorigin="anonymous"></script>'
+            resources = list(styles)
+            if styles != ("all",):
+                resources.append(self.core_style)
 
-        if style != "all":
-            core_url = self._get_url(
-                version, self.core_style, use_min, ext, serve_local
-            )
+        loaded = []
+        for style in resources:
+            url = self._get_url(version, style, use_min, ext, serve_local)
             if serve_local:
-                self._possibly_request_file(version, self.core_style, use_min, ext)
-                js += f'\n<script defer src="{core_url}"></script>'
+                resource_sri: Optional[str] = self._get_local_sri(
+                    self._get_file(version, style, use_min, ext)
+                )
             else:
-                js += f'\n<script defer src="{core_url}" integrity="{core_sri}" crossorigin="anonymous"></script>'
+                if style == self.core_style:
+                    resource_sri = core_sri
+                else:
+                    # the given SRI hash is ambiguous when loading several styles
+                    resource_sri = sri if len(styles) == 1 else None
+                resource_sri = resource_sri or _get_cdn_sri(
+                    version, style, use_min, ext
+                )
+                if resource_sri is None:
+                    current_app.logger.warning(
+                        "The SRI hash of %s is not in the version manifest, loading it without one. Pass it explicitly to verify its integrity.",
+                        url,
+                    )
+            loaded.append((url, resource_sri))
+        webfonts = [
+            webfont for style in styles for webfont in self._get_webfont_styles(style)
+        ]
+        return self._get_markup(ext, version, webfonts, serve_local, loaded)
+
+    @classmethod
+    def _provision_resources(
+        cls,
+        version: str,
+        styles: Tuple[str, ...],
+        use_min: bool,
+        ext: str,
+        download: bool,
+    ) -> List[str]:
+        """Provision the resources of the given styles (and the core resource) for serving locally, or their bundle (see `FONT_AWESOME_BUNDLE`).
+
+        Raises:
+            FileNotFoundError: When a resource is not available locally and `download` is `False`.
+
+        Returns:
+            List[str]: The styles of the resources to load.
+        """
+        resources = list(styles)
+        if styles != ("all",):
+            resources.append(cls.core_style)
+        if current_app.config["FONT_AWESOME_BUNDLE"] and len(resources) > 1:
+            return [cls._provision_bundle(version, styles, use_min, ext, download)]
+        for style in resources:
+            cls._possibly_request_file(version, style, use_min, ext, download)
+        return resources
+
+    def _get_markup(
+        self,
+        ext: str,
+        version: str,
+        webfonts: Iterable[str],
+        serve_local: bool,
+        resources: List[Tuple[str, Optional[str]]],
+    ) -> Tuple[Markup, Tuple[str, ...]]:
+        """Get the markup that loads the given resources (URL and SRI hash), preceded by their preload hints (or those of the given webfonts they use, for CSS resources) if enabled (see `FONT_AWESOME_PRELOAD`).
+
+        Returns:
+            Tuple[flask.Markup, Tuple[str, ...]]: The markup, and the values of the matching preload `Link` headers.
+        """
+        tags = [
+            RESOURCE_TAGS[ext].format(url=url, attributes=self._get_integrity(sri))
+            for url, sri in resources
+        ]
+        if not self._get_state().config["FONT_AWESOME_PRELOAD"]:
+            return Markup("\n".join(tags)), ()
+        preloads: List[Tuple[str, str, Optional[str]]] = []
+        if ext == "js":
+            preloads.extend((url, "script", sri) for url, sri in resources)
+        else:
+            # the webfonts are only discovered by the browser once the CSS is parsed
+            preloads.extend(
+                (self._get_webfont_url(version, webfont, serve_local), "font", None)
+                for webfont in dict.fromkeys(webfonts)
+            )
+        preload_tags = [_get_preload_tag(*preload) for preload in preloads]
+        links = tuple(_get_preload_link(url, _as) for url, _as, _ in preloads)
+        return Markup("\n".join(preload_tags + tags)), links
+
+    def _get_webfont_url(self, version: str, webfont: str, serve_local: bool) -> str:
+        """Get the URL of the `woff2` file of the given webfont, as referred to by the CSS resources."""
+        if serve_local:
+            # not fingerprinted, like the (relative) URLs in the CSS resources
+            return self._get_local_url(version, f"webfonts/{webfont}.woff2")
+        return self._get_url(version, webfont, False, "woff2", False, "webfonts")
+
+    @staticmethod
+    def _get_integrity(sri: Optional[str]) -> str:
+        """Get the `integrity` (and `crossorigin`) attributes of a tag for the given SRI hash (if known)."""
+        if sri is None:
+            return ""
+        return f' integrity="{sri}" crossorigin="anonymous"'
+
+    def _add_preload_links(self, links: Tuple[str, ...]) -> None:
+        """Record the given preload `Link` header values, to be added to the response of the current request."""
+        if links and has_request_context():
+            g.setdefault("_font_awesome_preload_links", {}).update(dict.fromkeys(links))
+
+    @staticmethod
+    def _add_preload_headers(response: Response) -> Response:
+        """Add the preload `Link` headers recorded while handling the current request to its response."""
+        links = g.pop("_font_awesome_preload_links", None)
+        if links:
+            response.headers.add("Link", ", ".join(links))
+        return response
 
-        return Markup(js)
+    @staticmethod
+    def _send_render_stats(response: Response) -> Response:
+        """Send the icon render statistics recorded while handling the current request (see :data:`~flask_font_awesome.signals.icons_rendered`).
+
+        For a streamed response, they are sent once its body has been generated, as its icons are rendered along with it (with `stream_with_context`, e.g. `stream_template`).
+        """
+        if (
+            response.is_streamed
+            and not response.direct_passthrough
+            and signals.icons_rendered.receivers
+        ):
+            # the icons rendered while streaming are recorded in the same (request) context
+            renders = g.setdefault("_font_awesome_renders", [0, 0.0])
+            response.response = FontAwesome._send_render_stats_after(
+                response.response, renders, signals._get_sender()
+            )
+            return response
+        renders = g.pop("_font_awesome_renders", None)
+        if renders is not None:
+            signals.icons_rendered.send(
+                signals._get_sender(), count=renders[0], duration=renders[1]
+            )
+        return response
+
+    @staticmethod
+    def _send_render_stats_after(
+        chunks: Iterable[Any], renders: List[Any], sender: Any
+    ) -> Iterator[Any]:
+        """Pass the given chunks of a streamed response body through, sending the given icon render statistics once they have all been generated."""
+        try:
+            yield from chunks
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            if renders[0]:
+                signals.icons_rendered.send(
+                    sender, count=renders[0], duration=renders[1]
+                )
 
-    def render_icon(  # noqa: C901
+    @classmethod
+    def _provision_bundle(
+        cls,
+        version: str,
+        styles: Sequence[str],
+        use_min: bool,
+        ext: str,
+        download: bool = True,
+    ) -> str:
+        """Provision the bundle of the core resource and the resources of the given styles (see `FONT_AWESOME_BUNDLE`).
+
+        The bundle is built from the local files once, and only rebuilt when one of them changes.
+
+        Raises:
+            FileNotFoundError: When one of the bundled files is not (yet) available locally and `download` is `False`.
+
+        Returns:
+            str: The (pseudo) style of the bundle, e.g. `bundle-solid-brands`.
+        """
+        sources = []
+        for style in (cls.core_style, *styles):
+            cls._possibly_request_file(version, style, use_min, ext, download)
+            sources.append(cls._get_file(version, style, use_min, ext))
+        bundle_style = f"{BUNDLE_STYLE_PREFIX}{'-'.join(styles)}"
+        file = cls._get_file(version, bundle_style, use_min, ext)
+
+        def is_stale() -> bool:
+            signature = cls._get_signature(file)
+            return signature is None or any(
+                source.stat().st_mtime_ns > signature[0] for source in sources
+            )
+
+        if not is_stale():
+            return bundle_style
+        with downloads.write_lock(file):
+            if not is_stale():
+                return (
+                    bundle_style  # built by another thread or process in the meantime
+                )
+            data = BUNDLE_SEPARATORS[ext].join(
+                source.read_bytes().rstrip() for source in sources
+            )
+            with downloads.atomic_write(file) as f:
+                f.write(data)
+            compression.write_compressed(file, data)
+            signature = cls._get_signature(file)
+            if signature is not None:
+                cls._set_digest(
+                    file, signature, hashlib.new(SRI_ALGORITHM, data).digest()
+                )
+            cls._invalidate_markup()
+        return bundle_style
+
+    def render_icon(
         self,
         name: str,
         inverse: bool = False,
@@ -320,10 +1672,12 @@ class FontAwesome:
         aria_hidden: bool = True,
         style: Optional[str] = None,
         _stack_size: Optional[str] = None,
+        _render_mode: Optional[str] = None,
+        _compile_time: bool = False,
     ) -> Markup:
         """Render an icon.
 
-        See the `Font Awesome documentation <https://fontawesome.com/search?o=r&m=free>`_ for the complete list of available icons.
+        See the `Font Awesome documentation <https://fontawesome.com/search?o=r&m=free>`_ for the complete list of available icons. When `FONT_AWESOME_RENDER_MODE` is `svg` (or `sprite`), the icon is rendered as inline SVG (or as a reference to its symbol in a sprite sheet) on the server instead. The rendered markup is cached per combination of arguments (see `FONT_AWESOME_ICON_CACHE_SIZE`).
 
         Some examples:
             >>> font_awesome.render_icon('fas fa-house')
@@ -343,37 +1697,296 @@ class FontAwesome:
             aria_hidden (bool): Add the `aria-hidden` attribute to the icon. Defaults to `True`.
             style (Optional[str]): Customize the icon even further using `CSS styling <https://fontawesome.com/v6/docs/web/style/custom>`_. Defaults to `None`.
 
+        Raises:
+            ValueError: When rendering as inline SVG and `name` does not refer to a known icon.
+
         Returns:
             flask.Markup: The HTML markup for the icon.
         """
-        icon = f'<i class="{name}'
-        if _stack_size:
-            icon += f" fa-stack-{_remove_prefix(_stack_size, 'fa-stack-')}"
+        render_mode = _render_mode or self._get_render_mode()
+        key = (
+            name,
+            inverse,
+            size,
+            fixed_with,
+            rotation,
+            animation,
+            border,
+            pull,
+            swap_opacity,
+            aria_hidden,
+            style,
+            _stack_size,
+            render_mode,
+        )
+        # not cached in `sprite` mode, as the icon is recorded for the sprite sheet of the current request
+        render = (
+            self._render_icon
+            if render_mode == "sprite"
+            else self._get_state().cached_render_icon
+        )
+        # icons rendered when a template is compiled are recorded by the template itself (see `_record_icons`)
+        if _compile_time or (
+            injection.rendered_icons.get() is None
+            and not signals.icons_rendered.receivers
+        ):
+            try:
+                return render(*key)
+            except TypeError as e:
+                return self._render_uncached(key, e)
+        return self._render_tracked(render, key)
+
+    def _render_uncached(self, key: Tuple[Any, ...], error: TypeError) -> Markup:
+        """Render an icon whose arguments can't be cached (i.e. are unhashable, e.g. a list as `style`), re-raising the given error of rendering it otherwise."""
+        try:
+            hash(key)
+        except TypeError:
+            return self._render_icon(*key)
+        raise error
+
+    def _render_tracked(
+        self, render: Callable[..., Markup], key: Tuple[Any, ...]
+    ) -> Markup:
+        """Render an icon while handling a request, recording its name (see `FONT_AWESOME_AUTO_INJECT`) and timing it (see :data:`~flask_font_awesome.signals.icons_rendered`)."""
+        icons = injection.rendered_icons.get()
+        if icons is not None:
+            icons.add(key[0])
+        try:
+            hash(key)
+        except TypeError:  # e.g. a list as `style`, which can't be cached
+            render = self._render_icon
+        if not signals.icons_rendered.receivers or not has_request_context():
+            return render(*key)
+        start = time.perf_counter()
+        markup = render(*key)
+        duration = time.perf_counter() - start
+        renders = g.setdefault("_font_awesome_renders", [0, 0.0])
+        renders[0] += 1
+        renders[1] += duration
+        return markup
+
+    def _record_icons(self, names: Iterable[str]) -> None:
+        """Record the given icons as rendered while handling the current request (see `FONT_AWESOME_AUTO_INJECT`), for icons whose markup was rendered when their template was compiled."""
+        icons = injection.rendered_icons.get()
+        if icons is not None:
+            icons.update(names)
+
+    @staticmethod
+    def _record_rendered_icons() -> None:
+        """Start recording the icons rendered while handling the current request (see `FONT_AWESOME_AUTO_INJECT`)."""
+        injection.rendered_icons.set(set())
+
+    def _render_icon(  # noqa: C901
+        self,
+        name: str,
+        inverse: bool,
+        size: Optional[str],
+        fixed_with: bool,
+        rotation: Optional[Union[str, int]],
+        animation: Optional[str],
+        border: bool,
+        pull: Optional[str],
+        swap_opacity: bool,
+        aria_hidden: bool,
+        style: Optional[str],
+        stack_size: Optional[str],
+        render_mode: str,
+    ) -> Markup:
+        """Render an icon (uncached, see `render_icon`)."""
+        classes = []
+        if stack_size:
+            classes.append(f"fa-stack-{_remove_prefix(stack_size, 'fa-stack-')}")
         if inverse:
-            icon += " fa-inverse"
+            classes.append("fa-inverse")
         if size is not None:
-            icon += f" fa-{_remove_prefix(size, 'fa-')}"
+            classes.append(f"fa-{_remove_prefix(size, 'fa-')}")
         if fixed_with:
-            icon += " fa-fw"
+            classes.append("fa-fw")
         if rotation is not None:
             if isinstance(rotation, int):
                 rotation = f"rotate-{rotation}"
-            icon += f" fa-{_remove_prefix(rotation, 'fa-')}"
+            classes.append(f"fa-{_remove_prefix(rotation, 'fa-')}")
         if animation is not None:
-            icon += f" fa-{_remove_prefix(animation, 'fa-')}"
+            classes.append(f"fa-{_remove_prefix(animation, 'fa-')}")
         if border:
-            icon += " fa-border"
+            classes.append("fa-border")
         if pull is not None:
-            icon += f" fa-pull-{_remove_prefix(pull, 'fa-pull-')}"
+            classes.append(f"fa-pull-{_remove_prefix(pull, 'fa-pull-')}")
         if swap_opacity:
-            icon += " fa-swap-opacity"
-        icon += '"'
+            classes.append("fa-swap-opacity")
+        attributes = ""
         if style is not None:
-            icon += f' style="{style}"'
+            attributes = f' style="{style}"'
         if aria_hidden:
-            icon += ' aria-hidden="true"'
-        icon += "></i>"
-        return Markup(icon)
+            attributes += ' aria-hidden="true"'
+        if render_mode in SVG_RENDER_MODES:
+            return self._render_svg(name, classes, attributes, render_mode)
+        return Markup(f'<i class="{" ".join([name, *classes])}"{attributes}></i>')
+
+    def render_icons(
+        self, specs: Iterable[Union[str, Mapping[str, Any]]]
+    ) -> Iterator[Markup]:
+        """Render many icons, e.g. one per row of a table.
+
+        Identical icons are only rendered once, and the icons are rendered lazily (so that the markup of large listings is never held in memory at once, e.g. when streaming the response with :func:`~flask.stream_with_context`). This is also available as the `fa_icons` filter in templates.
+
+        Some examples:
+            >>> font_awesome.render_icons(["fas fa-check", "fas fa-xmark", "fas fa-check"])
+            >>> font_awesome.render_icons([{"name": "fas fa-house", "size": "lg"}])
+            >>> {% for icon in rows | map(attribute="icon") | fa_icons %}{{ icon }}{% endfor %}
+
+        Args:
+            specs (Iterable[Union[str, Mapping[str, Any]]]): The names of the icons (e.g. `fa-solid fa-user`), or mappings of the arguments of :func:`render_icon() <flask_font_awesome.FontAwesome.render_icon>` (including `name`).
+
+        Raises:
+            ValueError: When rendering as inline SVG and a name does not refer to a known icon.
+
+        Yields:
+            flask.Markup: The HTML markup for each icon.
+        """
+        render_mode = self._get_render_mode()
+        rendered: Dict[Hashable, Markup] = {}
+        for spec in specs:
+            if isinstance(spec, str):
+                key: Hashable = spec
+                kwargs: Mapping[str, Any] = {"name": spec}
+            else:
+                key = tuple(sorted(spec.items()))
+                kwargs = spec
+            markup = rendered.get(key)
+            if markup is None:
+                markup = self.render_icon(**kwargs, _render_mode=render_mode)
+                if len(rendered) < RENDER_ICONS_MEMO_SIZE:
+                    rendered[key] = markup
+            yield markup
+
+    @staticmethod
+    def _get_render_mode() -> str:
+        """Get the configured render mode (`class` outside of an application context)."""
+        if not has_app_context():
+            return "class"
+        # bypass the proxy for the (frequent) config lookup
+        app: Flask = current_app._get_current_object()  # type: ignore
+        return app.config["FONT_AWESOME_RENDER_MODE"]
+
+    def _render_svg(
+        self, name: str, classes: List[str], attributes: str, render_mode: str
+    ) -> Markup:
+        """Render the icon with the given name as inline SVG (or as a reference to its symbol in the sprite sheet), with the given additional classes and attributes."""
+        icon, _, name_classes = self._get_state().assets.icon_index.find(name)
+        svg_classes = " ".join(
+            ["svg-inline--fa", f"fa-{icon.name}", *name_classes, *classes]
+        )
+        if render_mode == "sprite":
+            content = f'<use href="{self._get_sprite_href(icon)}"></use>'
+        else:
+            content = svg.render_paths(icon)
+        return Markup(svg.render_svg(icon, svg_classes, attributes, content))
+
+    def _get_sprite_href(self, icon: Icon) -> str:
+        """Get the reference to the symbol of the given icon in the sprite sheet."""
+        symbol_id = svg.get_symbol_id(icon)
+        if current_app.config["FONT_AWESOME_EXTERNAL_SPRITE"]:
+            state = self._get_state()
+            if not state.sprite_built:
+                if not (self._get_asset_folder(self.version) / SPRITE_FILE).exists():
+                    self.build_sprite()
+                state.sprite_built = True
+            return f"{self._get_local_url(self.version, SPRITE_FILE)}#{symbol_id}"
+        # remember the icon, so that its symbol is included by `render_sprite`
+        if "_font_awesome_sprite_icons" not in g:
+            g._font_awesome_sprite_icons = {}
+        g._font_awesome_sprite_icons.setdefault(symbol_id, icon)
+        return f"#{symbol_id}"
+
+    def render_sprite(self, icons: Optional[Iterable[str]] = None) -> Markup:
+        """Render the (inline) sprite sheet with the symbols of the icons rendered in `sprite` mode (see `FONT_AWESOME_RENDER_MODE`).
+
+        Include this once per page, after the last icon (e.g. at the end of the `<body>`). Symbols that were already rendered in the current request are not rendered again.
+
+        Some examples:
+            >>> font_awesome.render_sprite()
+            >>> font_awesome.render_sprite(["fas fa-house", "fab fa-github"])
+
+        Args:
+            icons (Optional[Iterable[str]]): The names of additional icons to include (e.g. `fa-solid fa-house`). Defaults to `None`.
+
+        Raises:
+            ValueError: When one of the icons is unknown.
+
+        Returns:
+            flask.Markup: The HTML markup for the sprite sheet.
+        """
+        sprite_icons = g.pop("_font_awesome_sprite_icons", {})
+        icon_index = self._get_state().assets.icon_index
+        for name in icons or ():
+            icon = icon_index.find(name)[0]
+            sprite_icons.setdefault(svg.get_symbol_id(icon), icon)
+        rendered = g.setdefault("_font_awesome_rendered_symbols", set())
+        new_icons = [
+            icon
+            for symbol_id, icon in sprite_icons.items()
+            if symbol_id not in rendered
+        ]
+        rendered.update(sprite_icons)
+        if not new_icons:
+            return Markup("")
+        return Markup("".join(svg.render_sprite(new_icons, hidden=True)))
+
+    @classmethod
+    def build_sprite(cls, icons: Optional[Iterable[str]] = None) -> Path:
+        """Build the external sprite sheet (a static SVG file with a symbol per icon), for use with `FONT_AWESOME_EXTERNAL_SPRITE`.
+
+        This is also available from the command line as `flask font-awesome sprite`.
+
+        Some examples:
+            >>> FontAwesome.build_sprite()
+            >>> FontAwesome.build_sprite(["fas fa-house", "fab fa-github"])
+
+        Args:
+            icons (Optional[Iterable[str]]): The names of the icons to include (e.g. `fa-solid fa-house`). Defaults to all icons.
+
+        Raises:
+            ValueError: When one of the icons is unknown.
+
+        Returns:
+            pathlib.Path: The sprite sheet.
+        """
+        icon_index = cls._get_assets().icon_index
+        if icons is None:
+            sprite_icons: Iterable[Icon] = icon_index
+        else:
+            sprite_icons = {icon_index.find(name)[0] for name in icons}
+        file = cls._get_asset_folder(cls.version) / SPRITE_FILE
+        with downloads.atomic_write(file) as f:
+            for part in svg.render_sprite(sprite_icons):
+                f.write(part.encode())
+        compression.write_compressed(file)
+        return file
+
+    def load_svg_css(self) -> Markup:
+        """Load the CSS that styles icons rendered as inline SVG (see `FONT_AWESOME_RENDER_MODE`).
+
+        Some examples:
+            >>> font_awesome.load_svg_css()
+
+        Returns:
+            flask.Markup: The HTML markup for the CSS resource.
+        """
+        self._mark_loaded()
+        return Markup(
+            f'<link rel="stylesheet" href="{url_for("font_awesome.svg_css")}" />'
+        )
+
+    @classmethod
+    def _send_svg_css(cls) -> Response:
+        """Send the CSS that styles icons rendered as inline SVG."""
+        response = Response(
+            cls._get_assets().icon_index.get_svg_css(), mimetype="text/css"
+        )
+        response.add_etag()
+        response.make_conditional(request)
+        return response
 
     def render_stacked_icon(
         self,
@@ -387,6 +2000,8 @@ class FontAwesome:
         style: Optional[str] = None,
         style_1: Optional[str] = None,
         style_2: Optional[str] = None,
+        _render_mode: Optional[str] = None,
+        _compile_time: bool = False,
     ) -> Markup:
         """Render a `stacked <https://fontawesome.com/v6/docs/web/style/stack>`_ icon.
 
@@ -421,16 +2036,33 @@ class FontAwesome:
         Returns:
             flask.Markup: The HTML markup for the icon.
         """
-        span = '<span class="fa-stack'
+        classes = ["fa-stack"]
         if size is not None:
-            span += f" fa-{_remove_prefix(size, 'fa-')}"
-        span += '"'
+            classes.append(f"fa-{_remove_prefix(size, 'fa-')}")
+        attributes = ""
         if style is not None:
-            span += f' style="{style}"'
+            attributes = f' style="{style}"'
         if aria_hidden:
-            span += ' aria-hidden="true"'
-        span += ">"
-        span += f"\n    {self.render_icon(name_1, inverse if stack_size_1 == '1x' else False, aria_hidden=False, style=style_1, _stack_size=stack_size_1)}"
-        span += f"\n    {self.render_icon(name_2, inverse if stack_size_2 == '1x' else False, aria_hidden=False, style=style_2, _stack_size=stack_size_2)}"
-        span += "\n</span>"
-        return Markup(span)
+            attributes += ' aria-hidden="true"'
+        parts = [
+            f'<span class="{" ".join(classes)}"{attributes}>',
+            self.render_icon(
+                name_1,
+                inverse if stack_size_1 == "1x" else False,
+                aria_hidden=False,
+                style=style_1,
+                _stack_size=stack_size_1,
+                _render_mode=_render_mode,
+                _compile_time=_compile_time,
+            ),
+            self.render_icon(
+                name_2,
+                inverse if stack_size_2 == "1x" else False,
+                aria_hidden=False,
+                style=style_2,
+                _stack_size=stack_size_2,
+                _render_mode=_render_mode,
+                _compile_time=_compile_time,
+            ),
+        ]
+        return Markup("\n    ".join(parts) + "\n</span>")
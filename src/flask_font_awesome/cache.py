@@ -0,0 +1,90 @@
+"""Caches of generated markup, and the tracking of the local files it was generated from."""
+
+import contextlib
+import contextvars
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, NamedTuple, Optional, Tuple
+
+# file -> (mtime, size) signature of the local files read while generating markup (if recording, see `recording_files`)
+_recorded_files: (
+    "contextvars.ContextVar[Optional[Dict[Path, Optional[Tuple[int, int]]]]]"
+) = contextvars.ContextVar("font_awesome_recorded_files", default=None)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a markup cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """A thread-safe, bounded mapping that evicts the least recently used entry when full."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[Any], Any],
+        is_valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Get the value for the given key, computing (and storing) it with `factory` (called with the key) on a miss, or when `is_valid` rejects the stored value."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        # validated outside of the lock, as it may access the file system
+        hit = value is not None and (is_valid is None or is_valid(value))
+        with self._lock:
+            if hit:
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = factory(key)
+        if self.maxsize > 0:
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Get the statistics of the cache."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+@contextlib.contextmanager
+def recording_files() -> Iterator[Dict[Path, Optional[Tuple[int, int]]]]:
+    """Record the local files read (see `record_file`) within this context, e.g. to regenerate markup when one of them is replaced (possibly by another process)."""
+    files: Dict[Path, Optional[Tuple[int, int]]] = {}
+    token = _recorded_files.set(files)
+    try:
+        yield files
+    finally:
+        _recorded_files.reset(token)
+
+
+def record_file(file: Path, signature: Optional[Tuple[int, int]]) -> None:
+    """Record that the given local file (with the given (mtime, size) signature) was read, if recording (see `recording_files`)."""
+    files = _recorded_files.get()
+    if files is not None:
+        files[file] = signature
@@ -0,0 +1,183 @@
+"""Command line interface of Font-Awesome-Flask (available as `flask font-awesome`)."""
+
+from pathlib import Path
+from typing import Optional, TextIO, Tuple
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from . import FontAwesome
+from .scanner import ScanResult, TemplateScanner
+
+SCAN_CACHE_FILE = "font_awesome_scan.json"
+
+cli = AppGroup("font-awesome", help="Manage Font Awesome's resources.")
+
+
+@cli.command("fetch")
+@click.option(
+    "--version",
+    show_default="latest",
+    help="The version to download.",
+)
+@click.option(
+    "--style",
+    "styles",
+    type=click.Choice(FontAwesome.style_choices),
+    multiple=True,
+    default=(FontAwesome.style,),
+    show_default=True,
+    help="The icon style(s) to download. Can be given multiple times.",
+)
+@click.option(
+    "--type",
+    "exts",
+    type=click.Choice(("css", "js")),
+    multiple=True,
+    default=("css", "js"),
+    show_default=True,
+    help="The resource type(s) to download: WebFonts + CSS and/or SVG + JS.",
+)
+@click.option(
+    "--min/--no-min",
+    "use_min",
+    default=FontAwesome.use_min,
+    show_default=True,
+    help="Whether to download the minified resources or not.",
+)
+@click.option(
+    "--workers",
+    "max_workers",
+    type=click.IntRange(min=1),
+    help="The maximum number of parallel downloads.",
+)
+@click.option(
+    "--force", is_flag=True, help="Also download files that are already present."
+)
+def fetch(
+    version: Optional[str],
+    styles: Tuple[str, ...],
+    exts: Tuple[str, ...],
+    use_min: bool,
+    max_workers: Optional[int],
+    force: bool,
+) -> None:
+    """Download Font Awesome's resources for serving locally ahead of time."""
+    font_awesome: FontAwesome = current_app.extensions["font_awesome"]
+    files = font_awesome.provision(version, styles, use_min, exts, max_workers, force)
+    for file, downloaded in files.items():
+        click.echo(f"Downloaded {file}" if downloaded else f"Not modified {file}")
+    count = sum(files.values())
+    click.echo(f"{count} file(s) downloaded, {len(files) - count} not modified.")
+
+
+@cli.command("subset")
+@click.argument("icons", nargs=-1)
+@click.option(
+    "--file",
+    "icons_file",
+    type=click.File(),
+    help="A file with the names of the icons to include, one per line.",
+)
+@click.option(
+    "--scan",
+    "scan_templates",
+    is_flag=True,
+    help="Include the icons used by the templates of the application.",
+)
+@click.option(
+    "--version",
+    show_default="latest",
+    help="The version of the core resources to build upon.",
+)
+@click.option(
+    "--min/--no-min",
+    "use_min",
+    default=FontAwesome.use_min,
+    show_default=True,
+    help="Whether to use the minified core resources or not.",
+)
+@click.option(
+    "--webfonts",
+    is_flag=True,
+    help="Subset the webfonts as well (requires fontTools).",
+)
+def subset(
+    icons: Tuple[str, ...],
+    icons_file: Optional[TextIO],
+    scan_templates: bool,
+    version: Optional[str],
+    use_min: bool,
+    webfonts: bool,
+) -> None:
+    """Build resources that only contain the given ICONS (e.g. "fas fa-house")."""
+    names = list(icons)
+    if icons_file is not None:
+        names.extend(line.strip() for line in icons_file if line.strip())
+    if scan_templates:
+        result = _scan(True)
+        names.extend(result.icons)
+    if not names:
+        raise click.UsageError("No icons given.")
+    font_awesome: FontAwesome = current_app.extensions["font_awesome"]
+    try:
+        files = font_awesome.build_subset(names, version, use_min, webfonts)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="ICONS") from e
+    except ImportError as e:
+        raise click.ClickException(str(e)) from e
+    for file in files.values():
+        click.echo(f"Built {file}")
+
+
+@cli.command("sprite")
+@click.argument("icons", nargs=-1)
+@click.option(
+    "--scan",
+    "scan_templates",
+    is_flag=True,
+    help="Include the icons used by the templates of the application.",
+)
+def sprite(icons: Tuple[str, ...], scan_templates: bool) -> None:
+    """Build the external sprite sheet with the given ICONS (all icons by default)."""
+    names = list(icons)
+    if scan_templates:
+        result = _scan(True)
+        names.extend(result.icons)
+    font_awesome: FontAwesome = current_app.extensions["font_awesome"]
+    try:
+        file = font_awesome.build_sprite(names or None)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="ICONS") from e
+    click.echo(f"Built {file}")
+
+
+@cli.command("scan")
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    show_default=True,
+    help="Whether to cache the results (in the instance folder) for subsequent scans.",
+)
+def scan(cache: bool) -> None:
+    """List the icons used by the templates of the application."""
+    result = _scan(cache)
+    for icon in sorted(result.icons):
+        click.echo(icon)
+    click.echo(
+        f"{len(result.icons)} icon(s) in style(s): {', '.join(sorted(result.styles))}",
+        err=True,
+    )
+
+
+def _scan(cache: bool) -> ScanResult:
+    """Scan the templates of the application, warning about those whose icons can not be determined statically."""
+    cache_file = Path(current_app.instance_path) / SCAN_CACHE_FILE if cache else None
+    result = TemplateScanner(current_app._get_current_object(), cache_file).scan()  # type: ignore
+    for template in result.unresolved:
+        click.echo(
+            f"Warning: {template} renders icons whose names can not be determined statically.",
+            err=True,
+        )
+    return result
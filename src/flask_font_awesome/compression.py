@@ -0,0 +1,78 @@
+"""Precompress static files (e.g. `all.min.js.gz` next to `all.min.js`), so they are served compressed without compressing them on the fly."""
+
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional, Protocol, Tuple
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional dependency, only `.gz` files are generated without it
+    brotli = None
+
+from .downloads import atomic_write, read_chunks
+
+# the types of static files that benefit from compression (i.e. not `woff2`, which is compressed already)
+COMPRESSIBLE_SUFFIXES = (".css", ".js", ".svg", ".ttf")
+
+
+class Compressor(Protocol):
+    """A streaming compressor, like :func:`zlib.compressobj`."""
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class BrotliCompressor:
+    """A streaming Brotli compressor with the interface of :func:`zlib.compressobj`."""
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=11)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+# content coding -> (suffix, compressor factory) of the precompressed static files, in order of preference
+CONTENT_CODINGS: Dict[str, Tuple[str, Callable[[], Compressor]]] = {
+    # `wbits=31` writes a gzip container (with a zero mtime, i.e. reproducible)
+    "gzip": (".gz", lambda: zlib.compressobj(9, zlib.DEFLATED, 31)),
+}
+if brotli is not None:
+    CONTENT_CODINGS = {
+        "br": (".br", BrotliCompressor),
+        **CONTENT_CODINGS,
+    }
+
+
+def write_compressed(file: Path, data: Optional[bytes] = None) -> None:
+    """Write the precompressed siblings of the given static file (e.g. `all.min.js.gz`), if it is compressible.
+
+    Unless its contents are given, the file is compressed in chunks, so large files (e.g. webfonts) are never read into memory as a whole.
+    """
+    if file.suffix not in COMPRESSIBLE_SUFFIXES:
+        return
+    for suffix, compressor_factory in CONTENT_CODINGS.values():
+        compressor = compressor_factory()
+        with atomic_write(file.with_name(file.name + suffix)) as f:
+            if data is not None:
+                f.write(compressor.compress(data))
+            else:
+                with file.open("rb") as source:
+                    for chunk in read_chunks(source):
+                        f.write(compressor.compress(chunk))
+            f.write(compressor.flush())
+
+
+def get_compressed(file: Path, coding: str) -> Optional[Path]:
+    """Get the precompressed sibling of the given static file for the given content coding, if it is up to date."""
+    compressed = file.with_name(file.name + CONTENT_CODINGS[coding][0])
+    try:
+        if compressed.stat().st_mtime_ns >= file.stat().st_mtime_ns:
+            return compressed
+    except OSError:
+        pass
+    return None
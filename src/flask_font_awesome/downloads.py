@@ -0,0 +1,233 @@
+"""Download Font Awesome's resources from the CDN: in chunks, with retries and a circuit breaker, and atomically (coordinated across threads and processes)."""
+
+import contextlib
+import functools
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Mapping, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+    import msvcrt
+
+# the size of the chunks in which files (and downloads) are read, to keep memory usage flat
+CHUNK_SIZE = 65536
+# the defaults of the download settings (also used outside of an application context)
+DOWNLOAD_DEFAULTS = {
+    "FONT_AWESOME_DOWNLOAD_TIMEOUT": 10.0,
+    "FONT_AWESOME_DOWNLOAD_RETRIES": 2,
+    "FONT_AWESOME_DOWNLOAD_BACKOFF": 0.5,
+    "FONT_AWESOME_CIRCUIT_BREAKER_THRESHOLD": 5,
+    "FONT_AWESOME_CIRCUIT_BREAKER_TIMEOUT": 60.0,
+}
+# the HTTP status codes of failed downloads that are worth retrying
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+class Download(NamedTuple):
+    """A file downloaded from the CDN."""
+
+    size: int
+    digest: bytes
+    validators: Dict[str, str]
+    """The URL and validators (`etag` and/or `last_modified`) to revalidate the file with, if any."""
+
+
+class CircuitBreaker:
+    """A thread-safe circuit breaker, which rejects calls for a while after too many consecutive failures.
+
+    Once `reset_timeout` seconds have passed, a single trial call is let through: the circuit closes again when it succeeds, and stays open for another `reset_timeout` seconds when it fails.
+    """
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self, reset_timeout: float) -> bool:
+        """Check whether a call is allowed (i.e. the circuit is closed, or a trial call is due)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < reset_timeout:
+                return False
+            self._opened_at = now  # reject other calls during the trial
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self, threshold: int) -> None:
+        """Record a failed call, opening the circuit after `threshold` consecutive failures."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= threshold:
+                self._opened_at = time.monotonic()
+
+
+# shared by all downloads from the CDN (within this process)
+circuit_breaker = CircuitBreaker()
+# file -> lock held (within this process) while writing that file
+_write_locks: Dict[Path, threading.Lock] = {}
+_write_locks_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on the given lock file, shared across processes."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # gave up after 10 attempts, try again
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def write_lock(file: Path) -> Iterator[None]:
+    """Hold the exclusive lock for (re)writing the given file, shared across threads and processes."""
+    with _write_locks_lock:
+        lock = _write_locks.setdefault(file, threading.Lock())
+    file.parent.mkdir(parents=True, exist_ok=True)
+    with lock, file_lock(file.with_name(f".{file.name}.lock")):
+        yield
+
+
+@contextlib.contextmanager
+def atomic_write(file: Path) -> Iterator[BinaryIO]:
+    """Write the given file atomically, via a temporary file that is moved into place when done."""
+    file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(
+        prefix=f".{file.name}.", suffix=".tmp", dir=file.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp_file, 0o644)
+        os.replace(tmp_file, file)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_file)
+        raise
+
+
+def read_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """Read the given file object in chunks (see `CHUNK_SIZE`)."""
+    return iter(functools.partial(f.read, CHUNK_SIZE), b"")
+
+
+def hash_file(file: Path, algorithm: str) -> bytes:
+    """Get the digest of the given file, reading it in chunks."""
+    hash = hashlib.new(algorithm)
+    with file.open("rb") as f:
+        for chunk in read_chunks(f):
+            hash.update(chunk)
+    return hash.digest()
+
+
+def download(
+    url: str,
+    file: Path,
+    algorithm: str,
+    settings: Mapping[str, Any] = DOWNLOAD_DEFAULTS,
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Download]:
+    """Download the given URL to the given file, in chunks, retrying transient failures with exponential backoff (see `FONT_AWESOME_DOWNLOAD_RETRIES`).
+
+    With conditional `headers` (`If-None-Match` / `If-Modified-Since`), the file is left untouched when it has not been modified. The timeout (see `FONT_AWESOME_DOWNLOAD_TIMEOUT`) applies to connecting and to every read, so a stalled connection fails instead of blocking forever. After `FONT_AWESOME_CIRCUIT_BREAKER_THRESHOLD` consecutive failed downloads, further downloads fail immediately for `FONT_AWESOME_CIRCUIT_BREAKER_TIMEOUT` seconds.
+
+    Args:
+        url (str): The URL to download.
+        file (pathlib.Path): The file to download it to.
+        algorithm (str): The hash algorithm of the digest of the downloaded file (e.g. `sha384`).
+        settings (Mapping[str, Any]): The download settings (see `DOWNLOAD_DEFAULTS`). Defaults to `DOWNLOAD_DEFAULTS`.
+        headers (Optional[Dict[str, str]]): Additional request headers. Defaults to `None`.
+
+    Raises:
+        ConnectionError: When downloads are rejected by the circuit breaker.
+        urllib.error.URLError: When the download failed (e.g. a timeout or an HTTP error).
+
+    Returns:
+        Optional[Download]: The size, digest and validators of the downloaded file, or `None` when it has not been modified.
+    """
+    request = urllib.request.Request(url, headers=headers or {})
+    timeout = settings["FONT_AWESOME_DOWNLOAD_TIMEOUT"]
+    retries = settings["FONT_AWESOME_DOWNLOAD_RETRIES"]
+    backoff = settings["FONT_AWESOME_DOWNLOAD_BACKOFF"]
+    threshold = settings["FONT_AWESOME_CIRCUIT_BREAKER_THRESHOLD"]
+    if not circuit_breaker.allow(settings["FONT_AWESOME_CIRCUIT_BREAKER_TIMEOUT"]):
+        raise ConnectionError(
+            f"Not downloading {url}, as the last {circuit_breaker.failures} downloads failed."
+        )
+    for attempt in range(retries + 1):
+        try:
+            result = _stream_to_file(request, file, algorithm, timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:  # not modified
+                circuit_breaker.record_success()
+                return None
+            if e.code not in RETRY_STATUS_CODES:
+                raise  # e.g. an unknown version, which retrying won't fix (and which isn't an outage)
+            if attempt == retries:
+                circuit_breaker.record_failure(threshold)
+                raise
+        except OSError:  # e.g. a timeout or a refused connection
+            if attempt == retries:
+                circuit_breaker.record_failure(threshold)
+                raise
+        else:
+            circuit_breaker.record_success()
+            return result
+        time.sleep(backoff * 2**attempt)
+    raise AssertionError("unreachable")
+
+
+def _stream_to_file(
+    request: urllib.request.Request, file: Path, algorithm: str, timeout: float
+) -> Download:
+    """Stream the response to the given request to the given file, hashing it along the way."""
+    hash = hashlib.new(algorithm)
+    size = 0
+    with urllib.request.urlopen(request, timeout=timeout) as response, atomic_write(
+        file
+    ) as f:
+        for chunk in read_chunks(response):
+            f.write(chunk)
+            hash.update(chunk)
+            size += len(chunk)
+        validators = {
+            key: value
+            for key, value in (
+                ("etag", response.headers.get("ETag")),
+                ("last_modified", response.headers.get("Last-Modified")),
+            )
+            if value is not None
+        }
+    if validators:
+        validators["url"] = request.full_url
+    return Download(size, hash.digest(), validators)
@@ -0,0 +1,150 @@
+"""A Jinja extension that renders icons with constant arguments once, when the template is compiled."""
+
+import inspect
+from typing import Any, List, Optional, Tuple, Union
+
+from jinja2 import Environment, nodes
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+from markupsafe import Markup
+
+# tag -> method of the `FontAwesome` extension instance that renders it
+TAGS = {
+    "fa_icon": "render_icon",
+    "fa_stacked_icon": "render_stacked_icon",
+}
+# the render modes whose markup only depends on the arguments (and can therefore be rendered at compile time)
+CONSTANT_RENDER_MODES = ("class", "svg")
+
+
+class FontAwesomeExtension(Extension):
+    """Adds the `fa_icon` and `fa_stacked_icon` tags, which take the same arguments as :func:`render_icon() <flask_font_awesome.FontAwesome.render_icon>` and :func:`render_stacked_icon() <flask_font_awesome.FontAwesome.render_stacked_icon>`.
+
+    When all arguments are constant, the icon is rendered (for each render mode that allows it) when the template is compiled, and its markup is embedded in the template as literal output. Otherwise (and in `sprite` mode), the icon is rendered at runtime.
+
+    Some examples:
+        >>> {% fa_icon "fas fa-house", size="lg" %}
+        >>> {% fa_stacked_icon "fas fa-square", "fab fa-github", inverse=True %}
+        >>> {% fa_icon user.icon %}
+    """
+
+    tags = set(TAGS)
+
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        # set for applications that inject the resources needed by their icons (see `FONT_AWESOME_AUTO_INJECT`)
+        environment.extend(font_awesome_auto_inject=False)
+
+    def parse(self, parser: Parser) -> Union[nodes.Node, List[nodes.Node]]:
+        token = next(parser.stream)
+        args: List[nodes.Expr] = []
+        kwargs: List[nodes.Keyword] = []
+        while parser.stream.current.type != "block_end":
+            if args or kwargs:
+                parser.stream.expect("comma")
+            if (
+                parser.stream.current.type == "name"
+                and parser.stream.look().type == "assign"
+            ):
+                key = parser.stream.current.value
+                parser.stream.skip(2)
+                kwargs.append(nodes.Keyword(key, parser.parse_expression()))
+            elif kwargs:
+                parser.fail(
+                    "positional argument follows keyword argument",
+                    parser.stream.current.lineno,
+                )
+            else:
+                args.append(parser.parse_expression())
+        method = TAGS[token.value]
+        call = self.call_method(
+            "_render", [nodes.Const(method), *args], kwargs, lineno=token.lineno
+        )
+        output = nodes.Output([call], lineno=token.lineno)
+        constant = self._render_constant(parser, method, args, kwargs, token.lineno)
+        if constant is None or not constant[0]:
+            return output
+        rendered, names = constant
+        # `{% if render_mode == "class" %}<markup>{% elif ... %}{% else %}<runtime call>{% endif %}`
+        render_mode = self.call_method("_get_render_mode", lineno=token.lineno)
+        branches = [
+            nodes.If(
+                nodes.Compare(render_mode, [nodes.Operand("eq", nodes.Const(mode))]),
+                [nodes.Output([nodes.TemplateData(markup)])],
+                [],
+                [],
+                lineno=token.lineno,
+            )
+            for mode, markup in rendered
+        ]
+        branches[0].elif_ = branches[1:]
+        branches[0].else_ = [output]
+        if not self.environment.font_awesome_auto_inject:  # type: ignore[attr-defined]
+            return branches[0]
+        # the rendered markup bypasses the extension instance, record its icons (see `FONT_AWESOME_AUTO_INJECT`)
+        record = self.call_method(
+            "_record_icons", [nodes.Const(names)], lineno=token.lineno
+        )
+        return [nodes.ExprStmt(record, lineno=token.lineno), branches[0]]
+
+    def _render_constant(
+        self,
+        parser: Parser,
+        method: str,
+        args: List[nodes.Expr],
+        kwargs: List[nodes.Keyword],
+        lineno: int,
+    ) -> Optional[Tuple[List[Tuple[str, str]], Tuple[str, ...]]]:
+        """Render the icon for each constant render mode, if all arguments are constant.
+
+        Returns:
+            Optional[Tuple[List[Tuple[str, str]], Tuple[str, ...]]]: The markup per render mode, and the names of the icons.
+        """
+        font_awesome = self.environment.globals.get("font_awesome")
+        if font_awesome is None:
+            return None
+        eval_ctx = nodes.EvalContext(self.environment)
+        try:
+            values = [arg.as_const(eval_ctx) for arg in args]
+            kw_values = {kwarg.key: kwarg.value.as_const(eval_ctx) for kwarg in kwargs}
+        except nodes.Impossible:
+            return None
+        try:
+            arguments = (
+                inspect.signature(getattr(font_awesome, method))
+                .bind(*values, **kw_values)
+                .arguments
+            )
+        except TypeError as e:
+            parser.fail(str(e), lineno)
+        names = tuple(
+            arguments[name]
+            for name in ("name", "name_1", "name_2")
+            if isinstance(arguments.get(name), str)
+        )
+        rendered = []
+        for mode in CONSTANT_RENDER_MODES:
+            try:
+                markup = getattr(font_awesome, method)(
+                    *values, **kw_values, _render_mode=mode, _compile_time=True
+                )
+            except TypeError as e:
+                parser.fail(str(e), lineno)
+            except ValueError:
+                # e.g. an icon that is unknown to the icon index, fail at runtime (and only in that mode)
+                continue
+            rendered.append((mode, str(markup)))
+        return rendered, names
+
+    def _get_render_mode(self) -> str:
+        font_awesome: Any = self.environment.globals["font_awesome"]
+        return font_awesome._get_render_mode()
+
+    def _record_icons(self, names: Tuple[str, ...]) -> None:
+        font_awesome: Any = self.environment.globals["font_awesome"]
+        font_awesome._record_icons(names)
+
+    def _render(self, method: str, *args: Any, **kwargs: Any) -> Markup:
+        return getattr(self.environment.globals["font_awesome"], method)(
+            *args, **kwargs
+        )
@@ -0,0 +1,356 @@
+"""Icon data of Font Awesome's free icon styles, extracted from the (bundled) SVG + JS resource.
+
+The icon data is extracted once into a memory-mapped index file (next to the SVG + JS resource, or in the cache directory of the current user if that is not writable), so that looking up an icon is O(1) and the index is shared between processes through the page cache. The index does not copy the SVG paths (the bulk of the icon data), but refers to them in the (memory-mapped) SVG + JS resource itself, which keeps it at a fraction of the size of the resource. The index file has the following layout (little-endian):
+
+- header: magic (`FAIX`), format version, mtime and size of the SVG + JS resource it was extracted from, and the number of hash table slots,
+- hash table: slots of (key offset, record offset), with open addressing (linear probing) on the CRC-32 of the key (`<style>:<name or alias>`),
+- keys: length-prefixed UTF-8 strings,
+- records: width, height, unicode codepoint, length-prefixed icon name and the (offset, length) of the path(s) in the SVG + JS resource.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .downloads import atomic_write
+
+# class name -> icon style
+STYLE_PREFIXES = {
+    "fa": "solid",
+    "fas": "solid",
+    "fa-solid": "solid",
+    "far": "regular",
+    "fa-regular": "regular",
+    "fab": "brands",
+    "fa-brands": "brands",
+}
+# icon style -> short prefix (as used in the `data-prefix` attribute)
+SHORT_PREFIXES = {"solid": "fas", "regular": "far", "brands": "fab"}
+DEFAULT_STYLE = "solid"
+
+PACK_PATTERN = re.compile(r'\(function\(\)\{[\w$]+\("(fa[brs])",([\w$]+)\)')
+UNQUOTED_KEY_PATTERN = re.compile(r"([{,])([\w$]+):\[")
+SVG_CSS_PATTERN = re.compile(r"='(:root, :host \{(?:[^'\\]|\\.)*)'")
+
+INDEX_MAGIC = b"FAIX"
+INDEX_FORMAT_VERSION = 2
+INDEX_HEADER = struct.Struct(
+    "<4sHQQI"
+)  # magic, format version, source mtime, source size, number of slots
+INDEX_SLOT = struct.Struct("<II")  # key offset, record offset
+INDEX_RECORD = struct.Struct("<HHIB")  # width, height, unicode, number of paths
+INDEX_PATH = struct.Struct("<II")  # offset and length of a path in the source
+STALENESS_CHECK_INTERVAL = 1.0  # seconds
+
+
+class Icon(NamedTuple):
+    """The SVG data of an icon."""
+
+    style: str
+    name: str
+    width: int
+    height: int
+    unicode: str
+    path: Union[str, Tuple[str, str]]  # (secondary, primary) for duotone icons
+
+
+def _parse_icons(source: str) -> Dict[str, Dict[str, Icon]]:
+    """Parse the icon definitions (including aliases) of every style pack in the given SVG + JS resource."""
+    icons: Dict[str, Dict[str, Icon]] = {}
+    for match in PACK_PATTERN.finditer(source):
+        prefix, var = match.groups()
+        start = source.rfind(f"var {var}={{", 0, match.start()) + len(f"var {var}=")
+        end = source.find("};", start) + 1
+        definitions = json.loads(
+            UNQUOTED_KEY_PATTERN.sub(r'\1"\2":[', source[start:end])
+        )
+        style = STYLE_PREFIXES[prefix]
+        style_icons = icons.setdefault(style, {})
+        for name, (width, height, aliases, unicode, path) in definitions.items():
+            icon = Icon(
+                style,
+                name,
+                width,
+                height,
+                unicode,
+                path if isinstance(path, str) else tuple(path),
+            )
+            style_icons[name] = icon
+            for alias in aliases:
+                if isinstance(alias, str):
+                    style_icons.setdefault(alias, icon)
+    return icons
+
+
+def _build_index(
+    icons: Dict[str, Dict[str, Icon]], signature: Tuple[int, int], source: bytes
+) -> bytes:
+    """Build the index file contents for the given icons, parsed from the given source (see the module docstring for its layout)."""
+    records = bytearray()
+    record_offsets: Dict[Icon, int] = {}
+    keys: List[Tuple[bytes, Icon]] = []
+    # the icons are defined in the order they were parsed in, so the source is only scanned once
+    position = 0
+    for style, style_icons in icons.items():
+        for name, icon in style_icons.items():
+            keys.append((f"{style}:{name}".encode(), icon))
+            if icon not in record_offsets:
+                record_offsets[icon] = len(records)
+                paths = (icon.path,) if isinstance(icon.path, str) else icon.path
+                records += INDEX_RECORD.pack(
+                    icon.width, icon.height, int(icon.unicode, 16), len(paths)
+                )
+                records += bytes([len(icon.name)]) + icon.name.encode()
+                for path in paths:
+                    data = f'"{path}"'.encode()
+                    offset = source.find(data, position)
+                    if offset < 0:  # out of order after all
+                        offset = source.index(data)
+                    position = offset + len(data)
+                    records += INDEX_PATH.pack(offset + 1, len(data) - 2)
+
+    num_slots = 1 << (2 * len(keys)).bit_length()
+    keys_offset = INDEX_HEADER.size + num_slots * INDEX_SLOT.size
+    key_data = bytearray()
+    slots = [(0, 0)] * num_slots
+    for key, icon in keys:
+        i = zlib.crc32(key) & (num_slots - 1)
+        while slots[i][0]:
+            i = (i + 1) & (num_slots - 1)
+        slots[i] = (keys_offset + len(key_data), record_offsets[icon])
+        key_data += bytes([len(key)]) + key
+    records_offset = keys_offset + len(key_data)
+
+    index = bytearray(
+        INDEX_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, *signature, num_slots)
+    )
+    for key_offset, record_offset in slots:
+        index += INDEX_SLOT.pack(
+            key_offset, records_offset + record_offset if key_offset else 0
+        )
+    return bytes(index + key_data + records)
+
+
+def parse_icon_name(name: str) -> Tuple[str, List[str]]:
+    """Split the class names of an icon into its style and its remaining class names."""
+    style = DEFAULT_STYLE
+    classes = []
+    for class_name in name.split():
+        if class_name in STYLE_PREFIXES:
+            style = STYLE_PREFIXES[class_name]
+        else:
+            classes.append(class_name)
+    return style, classes
+
+
+def _get_user_cache_dir() -> Optional[Path]:
+    """Get the cache directory of the current user (`$XDG_CACHE_HOME` or `~/.cache`), if it can be determined."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return Path(cache_home)
+    try:
+        return Path.home() / ".cache"
+    except (KeyError, RuntimeError):  # no home directory
+        return None
+
+
+class IconIndex:
+    """A lazily loaded index of the icons defined in the given SVG + JS resource.
+
+    Args:
+        source (pathlib.Path): The SVG + JS resource to extract the icons from.
+        index_file (Optional[pathlib.Path]): The index file. Defaults to `<source>.idx` (or a file in the cache directory of the current user, i.e. `$XDG_CACHE_HOME` or `~/.cache`, if the directory of `source` is not writable).
+    """
+
+    def __init__(self, source: Path, index_file: Optional[Path] = None) -> None:
+        self.source = source
+        self.index_file = index_file
+        # the memory-mapped index, the memory-mapped source and the number of hash table slots, replaced as a whole (and
+        # never closed explicitly, as other threads may still be reading the previous ones)
+        self._maps: Optional[Tuple[mmap.mmap, Union[mmap.mmap, bytes], int]] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._svg_css: Optional[Tuple[Tuple[int, int], str]] = None
+        self._lock = threading.Lock()
+
+    def _get_source_signature(self) -> Tuple[int, int]:
+        stat = self.source.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _get_index_files(self) -> List[Path]:
+        if self.index_file is not None:
+            return [self.index_file]
+        index_files = [self.source.with_name(f"{self.source.name}.idx")]
+        cache_dir = _get_user_cache_dir()
+        if cache_dir is not None:
+            digest = hashlib.sha1(str(self.source.resolve()).encode()).hexdigest()[:16]
+            index_files.append(cache_dir / "flask_font_awesome" / f"{digest}.idx")
+        return index_files
+
+    def _map_source(self) -> Tuple[Union[mmap.mmap, bytes], Tuple[int, int]]:
+        """Memory-map the source, and get the (mtime, size) signature of the mapped file."""
+        with self.source.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            signature = stat.st_mtime_ns, stat.st_size
+            if not stat.st_size:
+                return b"", signature  # empty files can't be memory-mapped
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), signature
+
+    @staticmethod
+    def _open(
+        index_file: Path, signature: Tuple[int, int]
+    ) -> Optional[Tuple[mmap.mmap, int]]:
+        """Memory-map the given index file (and get its number of hash table slots), if it exists and was extracted from the source with the given signature."""
+        try:
+            with open(index_file, "rb") as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # missing or empty
+            return None
+        magic, version, *index_signature, num_slots = INDEX_HEADER.unpack_from(index)
+        if (magic, version, tuple(index_signature)) != (
+            INDEX_MAGIC,
+            INDEX_FORMAT_VERSION,
+            signature,
+        ):
+            index.close()
+            return None
+        return index, num_slots
+
+    def _open_any(self, signature: Tuple[int, int]) -> Optional[Tuple[mmap.mmap, int]]:
+        """Memory-map the first index file that exists and was extracted from the source with the given signature."""
+        for index_file in self._get_index_files():
+            opened = self._open(index_file, signature)
+            if opened is not None:
+                return opened
+        return None
+
+    def _write(self, data: bytes) -> None:
+        """Atomically write the index file, to the first location that is writable."""
+        for index_file in self._get_index_files():
+            try:
+                with atomic_write(index_file) as f:
+                    f.write(data)
+                return
+            except OSError:
+                continue
+        raise OSError("Could not write the icon index to any location")
+
+    def _load(self) -> Tuple[mmap.mmap, Union[mmap.mmap, bytes], int]:
+        """Get the memory-mapped index and source (and the number of hash table slots), (re)building the index when missing or stale.
+
+        The source is checked for changes at most once every `STALENESS_CHECK_INTERVAL` seconds.
+        """
+        maps = self._maps
+        now = time.monotonic()
+        if maps is not None and now - self._checked_at < STALENESS_CHECK_INTERVAL:
+            return maps
+        signature = self._get_source_signature()
+        self._checked_at = now
+        if maps is not None and self._signature == signature:
+            return maps
+        with self._lock:
+            if self._maps is None or self._signature != signature:
+                # the signature of the mapped file, in case the source was replaced in the meantime
+                source, signature = self._map_source()
+                opened = self._open_any(signature)
+                if opened is None:
+                    data = bytes(source)
+                    self._write(
+                        _build_index(_parse_icons(data.decode()), signature, data)
+                    )
+                    opened = self._open_any(signature)
+                if opened is None:
+                    raise OSError("Could not read the icon index")
+                index, num_slots = opened
+                self._maps, self._signature = (index, source, num_slots), signature
+            return self._maps
+
+    def get(self, style: str, name: str) -> Optional[Icon]:
+        """Get the icon of the given style by its name (without `fa-` prefix) or alias."""
+        index, source, num_slots = self._load()
+        key = f"{style}:{name}".encode()
+        mask = num_slots - 1
+        i = zlib.crc32(key) & mask
+        while True:
+            key_offset, record_offset = INDEX_SLOT.unpack_from(
+                index, INDEX_HEADER.size + i * INDEX_SLOT.size
+            )
+            if not key_offset:
+                return None
+            if index[key_offset + 1 : key_offset + 1 + index[key_offset]] == key:
+                return self._read_record(index, source, style, record_offset)
+            i = (i + 1) & mask
+
+    def __iter__(self) -> Iterator[Icon]:
+        """Iterate over all icons (i.e. without aliases) in the index."""
+        index, source, num_slots = self._load()
+        for i in range(num_slots):
+            key_offset, record_offset = INDEX_SLOT.unpack_from(
+                index, INDEX_HEADER.size + i * INDEX_SLOT.size
+            )
+            if key_offset:
+                key = index[key_offset + 1 : key_offset + 1 + index[key_offset]]
+                style, name = key.decode().split(":", 1)
+                icon = self._read_record(index, source, style, record_offset)
+                if icon.name == name:
+                    yield icon
+
+    @staticmethod
+    def _read_record(
+        index: mmap.mmap, source: Union[mmap.mmap, bytes], style: str, offset: int
+    ) -> Icon:
+        width, height, unicode, num_paths = INDEX_RECORD.unpack_from(index, offset)
+        offset += INDEX_RECORD.size
+        name = index[offset + 1 : offset + 1 + index[offset]].decode()
+        offset += 1 + index[offset]
+        paths = []
+        for _ in range(num_paths):
+            path_offset, length = INDEX_PATH.unpack_from(index, offset)
+            paths.append(source[path_offset : path_offset + length].decode())
+            offset += INDEX_PATH.size
+        return Icon(
+            style,
+            name,
+            width,
+            height,
+            f"{unicode:x}",
+            paths[0] if num_paths == 1 else (paths[0], paths[1]),
+        )
+
+    def find(self, name: str) -> Tuple[Icon, str, List[str]]:
+        """Find the icon referred to by the given class names (e.g. `fa-solid fa-house fa-lg`).
+
+        Raises:
+            ValueError: When none of the class names refers to a known icon.
+
+        Returns:
+            Tuple[Icon, str, List[str]]: The icon, the name (or alias) it was referred to by, and the remaining class names (without style prefix and icon name).
+        """
+        style, classes = parse_icon_name(name)
+        for i, class_name in enumerate(classes):
+            if class_name.startswith("fa-"):
+                icon = self.get(style, class_name[3:])
+                if icon is not None:
+                    return icon, class_name[3:], classes[:i] + classes[i + 1 :]
+        raise ValueError(f"Unknown icon `{name}`")
+
+    def get_svg_css(self) -> str:
+        """Get the CSS that the SVG + JS resource injects into the page for styling inline SVG icons."""
+        signature = self._get_source_signature()
+        if self._svg_css is None or self._svg_css[0] != signature:
+            match = SVG_CSS_PATTERN.search(self.source.read_text())
+            if match is None:
+                raise ValueError(f"No SVG styles found in {self.source}")
+            self._svg_css = (
+                signature,
+                match.group(1).encode().decode("unicode_escape"),
+            )
+        return self._svg_css[1]
@@ -0,0 +1,58 @@
+"""Inject the resources needed by the icons rendered while handling a request into its HTML response (see `FONT_AWESOME_AUTO_INJECT`)."""
+
+import contextvars
+import re
+from typing import Callable, Iterable, Iterator, Optional, Set, Union
+
+# where the resources are injected into HTML responses
+HEAD_END_PATTERN = re.compile(rb"</head", re.IGNORECASE)
+BODY_END_PATTERN = re.compile(rb"</body", re.IGNORECASE)
+
+# the names of the icons rendered while handling the current request (a context variable, as `flask.g` is too slow to
+# update for every icon), or `None` when not recording them
+rendered_icons: "contextvars.ContextVar[Optional[Set[str]]]" = contextvars.ContextVar(
+    "font_awesome_rendered_icons", default=None
+)
+
+
+def inject(data: bytes, markup: bytes) -> bytes:
+    """Inject the given markup into the given HTML document, before `</head>` (or before `</body>`, without a `</head>` tag)."""
+    match = HEAD_END_PATTERN.search(data) or BODY_END_PATTERN.search(data)
+    if match is None:
+        return data
+    return data[: match.start()] + markup + data[match.start() :]
+
+
+def inject_into_stream(
+    chunks: Iterable[Union[bytes, str]], get_markup: Callable[[], Optional[bytes]]
+) -> Iterator[bytes]:
+    """Pass the given chunks of a streamed HTML document through, injecting the markup returned by `get_markup` (called once its `</body>` tag is reached) before its `</body>` tag.
+
+    Only what could be the start of a `</body>` tag split across chunks is held back, so the document is never buffered.
+    """
+    searching = True
+    pending = b""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if not searching:
+                yield chunk
+                continue
+            data = pending + chunk
+            match = BODY_END_PATTERN.search(data)
+            if match is None:
+                pending = data[-(len(b"</body") - 1) :]
+                if len(data) > len(pending):
+                    yield data[: len(data) - len(pending)]
+                continue
+            searching = False
+            pending = b""
+            markup = get_markup()
+            yield data[: match.start()] + (markup or b"") + data[match.start() :]
+        if pending:
+            yield pending
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,154 @@
+"""Discover the icons used by the Jinja templates of an application."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from flask import Flask
+from jinja2 import Environment, nodes
+
+from .downloads import atomic_write
+from .extension import FontAwesomeExtension
+from .icons import parse_icon_name
+
+# function/macro name -> names of the (positional) arguments that are icon names
+ICON_ARGUMENTS = {
+    "render_icon": ("name",),
+    "render_stacked_icon": ("name_1", "name_2"),
+    "render_stacked_icons": ("name_1", "name_2"),
+}
+PACKAGE_TEMPLATE_FOLDER = Path(__file__).resolve().parent / "templates"
+
+
+class ScanResult(NamedTuple):
+    """The result of scanning templates for icons."""
+
+    icons: Set[str]
+    """The names of the icons used (e.g. `fa-solid fa-house`)."""
+    unresolved: List[str]
+    """The templates with icon calls whose names could not be determined statically (e.g. variables)."""
+
+    @property
+    def styles(self) -> Set[str]:
+        """The icon styles used (e.g. `solid`)."""
+        return {parse_icon_name(icon)[0] for icon in self.icons}
+
+
+def _get_icon_arguments(call: nodes.Call) -> List[nodes.Expr]:
+    """Get the arguments that are icon names of the given call, if it renders an icon."""
+    args = call.args
+    if (
+        isinstance(call.node, nodes.ExtensionAttribute)
+        and call.node.identifier == FontAwesomeExtension.identifier
+        and call.node.name == "_render"
+    ):
+        # e.g. `{% fa_icon ... %}`, which compiles to `_render("render_icon", ...)`
+        function = args[0].as_const() if isinstance(args[0], nodes.Const) else None
+        args = args[1:]
+    elif isinstance(call.node, nodes.Getattr):
+        # e.g. `font_awesome.render_icon(...)` or `fa.render_icon(...)` (an imported macro)
+        function = call.node.attr
+    elif isinstance(call.node, nodes.Name):
+        # e.g. `render_icon(...)` (a macro imported from `font_awesome.html`)
+        function = call.node.name
+    else:
+        return []
+    if function not in ICON_ARGUMENTS:
+        return []
+    arguments = []
+    for i, argument_name in enumerate(ICON_ARGUMENTS[function]):
+        if i < len(args):
+            arguments.append(args[i])
+        else:
+            arguments.extend(
+                keyword.value for keyword in call.kwargs if keyword.key == argument_name
+            )
+    return arguments
+
+
+def scan_source(environment: Environment, source: str) -> Tuple[Set[str], bool]:
+    """Scan the given template source for icons.
+
+    Returns:
+        Tuple[Set[str], bool]: The names of the icons used, and whether there are icon calls whose names could not be determined statically.
+    """
+    icons = set()
+    unresolved = False
+    for call in environment.parse(source).find_all(nodes.Call):
+        for argument in _get_icon_arguments(call):
+            if isinstance(argument, nodes.Const) and isinstance(argument.value, str):
+                icons.add(" ".join(argument.value.split()))
+            else:
+                unresolved = True
+    return icons, unresolved
+
+
+class TemplateScanner:
+    """A scanner for the icons used by the templates of the given application.
+
+    The results are cached by template mtime and size (in memory and, optionally, in the given cache file), so that repeated scans only parse templates that changed.
+    """
+
+    def __init__(self, app: Flask, cache_file: Optional[Path] = None) -> None:
+        self.app = app
+        self.cache_file = cache_file
+        # template filename -> (mtime, size, icons, unresolved)
+        self._cache: Dict[str, Tuple[int, int, List[str], bool]] = {}
+        if cache_file is not None and cache_file.exists():
+            try:
+                self._cache = {
+                    filename: tuple(entry)  # type: ignore
+                    for filename, entry in json.loads(cache_file.read_text()).items()
+                }
+            except (ValueError, TypeError):
+                pass  # ignore a corrupt cache
+
+    def _scan_template(self, name: str) -> Tuple[Set[str], bool]:
+        environment = self.app.jinja_env
+        source, filename, _ = environment.loader.get_source(environment, name)  # type: ignore
+        if filename is None:
+            return scan_source(environment, source)
+        if Path(filename).resolve().parent == PACKAGE_TEMPLATE_FOLDER:
+            return set(), False  # the macros of this extension
+        stat = os.stat(filename)
+        cached = self._cache.get(filename)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return set(cached[2]), cached[3]
+        icons, unresolved = scan_source(environment, source)
+        self._cache[filename] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            sorted(icons),
+            unresolved,
+        )
+        return icons, unresolved
+
+    def _save_cache(self, cache_file: Path) -> None:
+        """Write the cache to the given file (atomically, as other processes may read it), without the templates that no longer exist."""
+        self._cache = {
+            filename: entry
+            for filename, entry in self._cache.items()
+            if os.path.exists(filename)
+        }
+        with atomic_write(cache_file) as f:
+            f.write(json.dumps(self._cache).encode())
+
+    def scan(self) -> ScanResult:
+        """Scan all templates of the application for icons.
+
+        Templates are parsed one after the other, as parsing is CPU-bound (i.e. would not run in parallel in threads).
+
+        Returns:
+            ScanResult: The icons used, and the templates with icons that could not be determined statically.
+        """
+        icons: Set[str] = set()
+        unresolved = []
+        for template in self.app.jinja_env.list_templates():
+            template_icons, template_unresolved = self._scan_template(template)
+            icons |= template_icons
+            if template_unresolved:
+                unresolved.append(template)
+        if self.cache_file is not None:
+            self._save_cache(self.cache_file)
+        return ScanResult(icons, unresolved)
@@ -0,0 +1,38 @@
+"""Signals sent by the extension, for instrumentation (see also :class:`~flask_font_awesome.stats.Stats`).
+
+Each signal is sent with the current application as its sender (or `None` outside of an application context), and only
+if it has receivers, so that instrumentation costs (next to) nothing when it is not used.
+
+Some examples:
+    >>> from flask_font_awesome import signals
+    >>> @signals.download_finished.connect_via(app)
+    ... def log_download(sender, url, file, size, duration, **extra):
+    ...     app.logger.info("Downloaded %s (%d bytes) in %.3fs", url, size, duration)
+"""
+
+from typing import Any
+
+from blinker import Namespace
+from flask import current_app, has_app_context
+
+_signals = Namespace()
+
+download_started = _signals.signal("font-awesome-download-started")
+"""Sent before downloading a resource from the CDN, with the `url` and the `file` it is downloaded to."""
+download_finished = _signals.signal("font-awesome-download-finished")
+"""Sent after downloading a resource from the CDN, with the `url`, the `file`, its `size` (in bytes), the `duration` of the download (in seconds) and whether it was `modified` (`False` when revalidating it showed it to be unchanged)."""
+download_failed = _signals.signal("font-awesome-download-failed")
+"""Sent when downloading a resource from the CDN failed, with the `url`, the `file`, the `error` and the `duration` of the attempt (in seconds)."""
+version_checked = _signals.signal("font-awesome-version-checked")
+"""Sent when checking whether a local resource is of the requested `version`, with the `file` and whether the outcome was cached (`hit`) or the file had to be scanned."""
+markup_cache_accessed = _signals.signal("font-awesome-markup-cache-accessed")
+"""Sent when the markup of :meth:`~flask_font_awesome.FontAwesome.load_css` / :meth:`~flask_font_awesome.FontAwesome.load_js` is looked up, with whether it was cached (`hit`)."""
+icons_rendered = _signals.signal("font-awesome-icons-rendered")
+"""Sent once per request that rendered icons at runtime (after the request is handled, or once the body of a streamed response has been generated), with the `count` of icons and the cumulative `duration` of rendering them (in seconds)."""
+
+
+def _get_sender() -> Any:
+    """Get the sender of a signal: the current application (if any)."""
+    if has_app_context():
+        return current_app._get_current_object()  # type: ignore
+    return None
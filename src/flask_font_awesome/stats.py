@@ -0,0 +1,92 @@
+"""Statistics of the activity of the extension, collected from its signals."""
+
+import threading
+from typing import Any, Dict
+
+from . import signals
+
+# counter -> description, in the order they are reported in
+COUNTERS = {
+    "downloads": "The number of resources downloaded from the CDN.",
+    "downloads_not_modified": "The number of resources revalidated with the CDN that were not modified (and therefore not downloaded again).",
+    "download_failures": "The number of failed downloads.",
+    "download_bytes": "The total size of the downloaded resources (in bytes).",
+    "download_seconds": "The total time spent downloading resources (in seconds).",
+    "version_check_hits": "The number of version checks of local resources whose outcome was cached.",
+    "version_check_misses": "The number of version checks that scanned a local resource.",
+    "markup_cache_hits": "The number of resource tags served from the markup cache.",
+    "markup_cache_misses": "The number of resource tags that were generated.",
+    "icons_rendered": "The number of icons rendered at runtime while handling requests.",
+    "icon_render_seconds": "The total time spent rendering icons at runtime (in seconds).",
+    "requests_with_icons": "The number of requests that rendered icons at runtime.",
+}
+
+
+class Stats:
+    """Counters of the activity of the extension for the given application: downloads, version checks, markup cache lookups and icon renders.
+
+    These are available as `font_awesome.stats` when `FONT_AWESOME_STATS` is enabled. Export them to your metrics system (e.g. Prometheus or StatsD) from a snapshot.
+
+    Some examples:
+        >>> font_awesome.stats.snapshot()
+        {'downloads': 2, 'download_failures': 0, 'download_bytes': 512443, ...}
+        >>> for name, value in font_awesome.stats.snapshot().items():
+        ...     statsd.gauge(f"font_awesome.{name}", value)
+
+    Args:
+        sender (Any): The application to collect the statistics of.
+    """
+
+    def __init__(self, sender: Any) -> None:
+        self._counters: Dict[str, float] = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+        signals.download_finished.connect(self._on_download_finished, sender)
+        signals.download_failed.connect(self._on_download_failed, sender)
+        signals.version_checked.connect(self._on_version_checked, sender)
+        signals.markup_cache_accessed.connect(self._on_markup_cache_accessed, sender)
+        signals.icons_rendered.connect(self._on_icons_rendered, sender)
+
+    def _add(self, **values: float) -> None:
+        with self._lock:
+            for name, value in values.items():
+                self._counters[name] += value
+
+    def _on_download_finished(
+        self,
+        sender: Any,
+        size: int,
+        duration: float,
+        modified: bool = True,
+        **extra: Any,
+    ) -> None:
+        self._add(
+            **{"downloads" if modified else "downloads_not_modified": 1},
+            download_bytes=size,
+            download_seconds=duration,
+        )
+
+    def _on_download_failed(self, sender: Any, duration: float, **extra: Any) -> None:
+        self._add(download_failures=1, download_seconds=duration)
+
+    def _on_version_checked(self, sender: Any, hit: bool, **extra: Any) -> None:
+        self._add(**{"version_check_hits" if hit else "version_check_misses": 1})
+
+    def _on_markup_cache_accessed(self, sender: Any, hit: bool, **extra: Any) -> None:
+        self._add(**{"markup_cache_hits" if hit else "markup_cache_misses": 1})
+
+    def _on_icons_rendered(
+        self, sender: Any, count: int, duration: float, **extra: Any
+    ) -> None:
+        self._add(
+            icons_rendered=count, icon_render_seconds=duration, requests_with_icons=1
+        )
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get the current values of all counters (see `COUNTERS`)."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        """Reset all counters to zero."""
+        with self._lock:
+            self._counters = dict.fromkeys(COUNTERS, 0)
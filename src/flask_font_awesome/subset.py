@@ -0,0 +1,186 @@
+"""Build subsets of Font Awesome's resources that only contain the icons used by an application."""
+
+import io
+import json
+import re
+from typing import Collection, Dict, List, Mapping, Set
+
+try:
+    from fontTools import subset as font_subset  # type: ignore
+    from fontTools.ttLib import TTFont  # type: ignore
+except ImportError:  # optional dependency, webfonts can not be subset without it
+    font_subset = None
+    TTFont = None
+
+from .icons import STYLE_PREFIXES, Icon
+
+ICON_SELECTOR_PATTERN = re.compile(r"\.fa-([\w-]+)(?:::?before)?")
+ICON_RULE_PATTERN = re.compile(r"(?P<selectors>[^{}@]+)\{(?P<body>[^{}]*)\}")
+FONT_FACE_PATTERN = re.compile(r"@font-face\s*\{(?P<body>[^{}]*)\}")
+FONT_URL_PATTERN = re.compile(
+    r"""url\(\s*(["']?)\.\./webfonts/(?P<name>[\w-]+)\.\w+(?:[?#][^"')]*)?\1\s*\)"""
+)
+
+# Mirrors how the style packs of the SVG + JS resource define their icons: through the hook of the core resource if it
+# is already loaded, or in the global namespace (to be picked up by the core resource later) otherwise.
+JS_TEMPLATE = """\
+(()=>{{var w="undefined"!=typeof window?window:{{}},n=w.___FONT_AWESOME___=w.___FONT_AWESOME___||{{}};\
+n.styles=n.styles||{{}};n.hooks=n.hooks||{{}};n.shims=n.shims||[];\
+function d(p,i){{"function"==typeof n.hooks.addPack?n.hooks.addPack(p,i):n.styles[p]=Object.assign({{}},n.styles[p]||{{}},i)}}\
+{definitions}}})();
+"""
+
+
+def build_js(icons: Dict[Icon, Set[str]], core_js: str) -> str:
+    """Build an SVG + JS resource that only defines the given icons, followed by the given core SVG + JS resource.
+
+    Args:
+        icons (Dict[Icon, Set[str]]): The icons to define, mapped to the names (or aliases) they are referred to by.
+        core_js (str): The core SVG + JS resource (i.e. `fontawesome.js`).
+
+    Returns:
+        str: The SVG + JS resource.
+    """
+    packs: Dict[str, Dict[str, list]] = {}
+    for icon, names in icons.items():
+        packs.setdefault(icon.style, {})[icon.name] = [
+            icon.width,
+            icon.height,
+            sorted(names - {icon.name}),
+            icon.unicode,
+            icon.path if isinstance(icon.path, str) else list(icon.path),
+        ]
+    definitions = ""
+    for style, pack in packs.items():
+        definitions += f"var i={json.dumps(pack, separators=(',', ':'))};"
+        for prefix, prefix_style in STYLE_PREFIXES.items():
+            if prefix_style == style:
+                definitions += f'd("{prefix}",i);'
+    return JS_TEMPLATE.format(definitions=definitions) + core_js
+
+
+def _split_rules(css: str) -> List[str]:
+    """Split the given CSS into its top-level rules, at-rules and comments."""
+    rules = []
+    start = depth = 0
+    i = 0
+    while i < len(css):
+        c = css[i]
+        if css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            i = len(css) if end == -1 else end + 2
+            if depth == 0:
+                rules.append(css[start:i])
+                start = i
+            continue
+        if c in "\"'":
+            end = i + 1
+            while end < len(css) and css[end] != c:
+                end += 2 if css[end] == "\\" else 1
+            i = end + 1
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start : i + 1])
+                start = i + 1
+        elif c == ";" and depth == 0:
+            rules.append(css[start : i + 1])
+            start = i + 1
+        i += 1
+    rules.append(css[start:])
+    return [rule for rule in rules if rule.strip()]
+
+
+def trim_css(css: str, names: Collection[str]) -> str:
+    """Remove the rules of all icons but the given ones from the given (core) WebFonts + CSS resource.
+
+    Args:
+        css (str): The core WebFonts + CSS resource (i.e. `fontawesome.css`).
+        names (Collection[str]): The names (and aliases) of the icons to keep.
+
+    Returns:
+        str: The trimmed WebFonts + CSS resource.
+    """
+    trimmed = []
+    for rule in _split_rules(css):
+        match = ICON_RULE_PATTERN.fullmatch(rule.strip())
+        if match is not None and (
+            "--fa:" in match["body"] or "content:" in match["body"]
+        ):
+            selectors = [selector.strip() for selector in match["selectors"].split(",")]
+            selector_matches = [
+                ICON_SELECTOR_PATTERN.fullmatch(selector) for selector in selectors
+            ]
+            if all(selector_matches):
+                kept = [
+                    selector
+                    for selector, selector_match in zip(selectors, selector_matches)
+                    if selector_match is not None and selector_match[1] in names
+                ]
+                if kept:
+                    trimmed.append(f"{','.join(kept)}{{{match['body']}}}")
+                continue
+        trimmed.append(rule)
+    return "".join(trimmed)
+
+
+def build_font(font: bytes, unicodes: Collection[int]) -> bytes:
+    """Build a WOFF2 webfont that only contains the glyphs of the given code points, from the given (full) webfont.
+
+    This requires `fontTools <https://pypi.org/project/fonttools/>`_ (with WOFF2 support, i.e. `fonttools[woff]`).
+
+    Args:
+        font (bytes): The full webfont (e.g. `fa-solid-900.ttf`), in any format supported by fontTools.
+        unicodes (Collection[int]): The code points of the glyphs to keep.
+
+    Raises:
+        ImportError: When fontTools is not installed.
+
+    Returns:
+        bytes: The WOFF2 webfont.
+    """
+    if font_subset is None:
+        raise ImportError(
+            'Subsetting webfonts requires fontTools, install it with `pip install "Font-Awesome-Flask[fonttools]"`.'
+        )
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    ttfont = TTFont(io.BytesIO(font))
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(ttfont)
+    output = io.BytesIO()
+    font_subset.save_font(ttfont, output, options)
+    return output.getvalue()
+
+
+def replace_fonts(css: str, fonts: Mapping[str, str]) -> str:
+    """Point the `@font-face` rules of the given WebFonts + CSS resource that use one of the given webfonts to its (WOFF2) replacement.
+
+    Args:
+        css (str): The WebFonts + CSS resource (e.g. `solid.css`).
+        fonts (Mapping[str, str]): The names of the webfonts to replace (e.g. `fa-solid-900`), mapped to the names of their replacements (which are expected next to them).
+
+    Returns:
+        str: The WebFonts + CSS resource using the replacements.
+    """
+
+    def replace(match: "re.Match[str]") -> str:
+        names = [url["name"] for url in FONT_URL_PATTERN.finditer(match["body"])]
+        replacement = next((fonts[name] for name in names if name in fonts), None)
+        if replacement is None:
+            return match[0]
+        declarations = [
+            declaration
+            for declaration in match["body"].split(";")
+            if declaration.strip() and not declaration.strip().startswith("src")
+        ]
+        declarations.append(f'src:url(../webfonts/{replacement}.woff2) format("woff2")')
+        return f"@font-face{{{';'.join(declarations)}}}"
+
+    return FONT_FACE_PATTERN.sub(replace, css)
@@ -0,0 +1,58 @@
+"""Render icons as inline SVG, and sprite sheets of their symbols (see `FONT_AWESOME_RENDER_MODE`)."""
+
+from typing import Iterable, Iterator
+
+from .icons import SHORT_PREFIXES, Icon
+
+
+def render_paths(icon: Icon) -> str:
+    """Render the SVG path element(s) of the given icon."""
+    if isinstance(icon.path, str):
+        return f'<path fill="currentColor" d="{icon.path}"></path>'
+    secondary, primary = icon.path
+    return (
+        '<g class="fa-duotone-group">'
+        f'<path class="fa-secondary" fill="currentColor" d="{secondary}"></path>'
+        f'<path class="fa-primary" fill="currentColor" d="{primary}"></path>'
+        "</g>"
+    )
+
+
+def render_svg(icon: Icon, classes: str, attributes: str, content: str) -> str:
+    """Render the SVG element of the given icon, with the given classes, (additional) attributes and content (e.g. its path elements)."""
+    return (
+        f'<svg class="{classes}" data-prefix="{SHORT_PREFIXES[icon.style]}" data-icon="{icon.name}" role="img" viewBox="0 0 {icon.width} {icon.height}"{attributes}>'
+        f"{content}</svg>"
+    )
+
+
+def get_symbol_id(icon: Icon) -> str:
+    """Get the ID of the symbol of the given icon in a sprite sheet."""
+    return f"fa-{icon.style}-{icon.name}"
+
+
+def render_symbol(icon: Icon) -> str:
+    """Render the SVG symbol element of the given icon (for use in a sprite sheet)."""
+    return (
+        f'<symbol id="{get_symbol_id(icon)}" viewBox="0 0 {icon.width} {icon.height}">'
+        f"{render_paths(icon)}</symbol>"
+    )
+
+
+def render_sprite(icons: Iterable[Icon], hidden: bool = False) -> Iterator[str]:
+    """Render a sprite sheet with a symbol per given icon, in parts (so that it never has to be held in memory as a whole, e.g. when writing it to a file).
+
+    Args:
+        icons (Iterable[Icon]): The icons to include.
+        hidden (bool): Whether to hide the sprite sheet (when it is inlined into a page). Defaults to `False`.
+
+    Yields:
+        str: The parts of the sprite sheet.
+    """
+    if hidden:
+        yield '<svg xmlns="http://www.w3.org/2000/svg" style="display: none">'
+    else:
+        yield '<svg xmlns="http://www.w3.org/2000/svg">'
+    for icon in icons:
+        yield render_symbol(icon)
+    yield "</svg>"